@@ -0,0 +1,4 @@
+from common.benchmark import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+import argparse
+import copy
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from common import generators
+from common.days import Day, Part, load_solution, select_parts
+
+
+@dataclass
+class Timings:
+    runs: int
+    min: float
+    median: float
+    p95: float
+
+    @classmethod
+    def from_samples(cls, samples: List[float]) -> 'Timings':
+        ordered = sorted(samples)
+        # nearest-rank percentile
+        p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+        return cls(len(ordered), ordered[0], statistics.median(ordered), p95)
+
+
+def measure(action: Callable[[], Any], repeat: int, warmup: int, setup: Callable[[], Any] = lambda: None) -> Timings:
+    """ Times `action(setup())` `repeat` times after `warmup` untimed runs; `setup` itself is never timed. """
+    samples = []
+    for trial in range(warmup + repeat):
+        argument = setup()
+        start = time.perf_counter()
+        action(argument)
+        elapsed = time.perf_counter() - start
+        if trial >= warmup:
+            samples.append(elapsed)
+    return Timings.from_samples(samples)
+
+
+def benchmark_day(day: Day, parts: List[Part], repeat: int, warmup: int, path: str) -> Dict[str, Timings]:
+    solution = load_solution(day)
+    results = {'parse': measure(lambda _: day.parse(solution, path), repeat, warmup)}
+
+    data = day.parse(solution, path)
+    for part in parts:
+        # every trial gets a fresh copy, as some tasks mutate the parsed input
+        results[part.name] = measure(lambda copied: part.solve(solution, copied), repeat, warmup, lambda: copy.deepcopy(data))
+
+    return results
+
+
+def run_benchmarks(
+        selectors: List[str],
+        repeat: int,
+        warmup: int,
+        input_path: Optional[str] = None,
+        size: Optional[int] = None,
+        seed: int = 0,
+        params: Optional[Dict[str, int]] = None
+) -> Dict[str, Timings]:
+    parts_by_day: Dict[int, Tuple[Day, List[Part]]] = {}
+    for day, part in select_parts(selectors):
+        parts_by_day.setdefault(day.number, (day, []))[1].append(part)
+
+    results = {}
+    for day, parts in parts_by_day.values():
+        path = input_path or str(generators.input_path(day, size, seed, params))
+        for name, timings in benchmark_day(day, parts, repeat, warmup, path).items():
+            results[f'{day.number}:{name}'] = timings
+    return results
+
+
+def to_json(results: Dict[str, Timings], repeat: int, warmup: int) -> Dict[str, Any]:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'warmup': warmup,
+        'results': {key: asdict(timings) for key, timings in results.items()},
+    }
+
+
+def find_regressions(results: Dict[str, Timings], baseline: Dict[str, Any], threshold: float, metric: str) -> List[str]:
+    regressions = []
+    for key, timings in results.items():
+        if key not in baseline['results']:
+            continue
+        before = baseline['results'][key][metric]
+        after = getattr(timings, metric)
+        if after > before * (1 + threshold):
+            regressions.append(f'{key}: {metric} {before * 1000:.2f}ms -> {after * 1000:.2f}ms (+{(after / before - 1) * 100:.0f}%)')
+    return regressions
+
+
+def print_results(results: Dict[str, Timings]):
+    print(f'{"part":>8}  {"min":>10} {"median":>10} {"p95":>10}')
+    for key, timings in results.items():
+        print(f'{key:>8}  {timings.min * 1000:>8.2f}ms {timings.median * 1000:>8.2f}ms {timings.p95 * 1000:>8.2f}ms')
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Benchmarks parsing and every part of the 2021 solutions.')
+    parser.add_argument('selectors', nargs='*', metavar='DAY[:PART]', help='days or parts to benchmark, all by default')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timed trials')
+    parser.add_argument('--warmup', type=int, default=1, help='number of untimed trials before the timed ones')
+    parser.add_argument('--input', help='input file to use instead of the input.txt of the day')
+    generators.add_arguments(parser)
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1, help='allowed slowdown against the baseline, 0.1 is 10%%')
+    parser.add_argument('--metric', choices=('min', 'median', 'p95'), default='median', help='timing compared against the baseline')
+    args = parser.parse_args(argv)
+
+    params = generators.parse_params(args.param)
+    results = run_benchmarks(args.selectors, args.repeat, args.warmup, args.input, args.generate, args.seed, params)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w') as writer:
+            json.dump(to_json(results, args.repeat, args.warmup), writer, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as reader:
+            baseline = json.load(reader)
+        regressions = find_regressions(results, baseline, args.threshold, args.metric)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            sys.exit(1)
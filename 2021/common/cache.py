@@ -0,0 +1,85 @@
+import hashlib
+import os
+import pickle
+import zlib
+from pathlib import Path
+from typing import Any, Optional
+
+from common.days import ROOT, Day
+
+CACHE_DIR = ROOT / '.cache'
+COMMON_DIR = Path(__file__).resolve().parent
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as reader:
+        for chunk in iter(lambda: reader.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_digest(day: Day) -> str:
+    """ Covers the solution and the shared code it may use, so that editing either invalidates the entries. """
+    digest = hashlib.sha256()
+    for path in [day.directory / 'solution.py', *sorted(COMMON_DIR.glob('*.py'))]:
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class Cache:
+    """ On-disk cache of pickled, zlib-compressed values with least recently used eviction. """
+
+    def __init__(self, directory: Path = CACHE_DIR, max_bytes: int = 256 << 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(day: Day, input_path: str, kind: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(file_digest(Path(input_path)).encode())
+        digest.update(source_digest(day).encode())
+        digest.update(kind.encode())
+        return f'{day.directory.name}_{kind}_{digest.hexdigest()}'
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self.directory / key
+        try:
+            with open(path, 'rb') as reader:
+                value = pickle.loads(zlib.decompress(reader.read()))
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError):
+            return None
+        # modification time doubles as the last access time for eviction
+        os.utime(path)
+        return value
+
+    def put(self, key: str, value: Any):
+        try:
+            data = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            return
+
+        self.directory.mkdir(exist_ok=True)
+        partial = self.directory / f'{key}.{os.getpid()}.tmp'
+        partial.write_bytes(data)
+        partial.replace(self.directory / key)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for path in self.directory.iterdir():
+            if path.suffix == '.tmp':
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,142 @@
+import importlib.util
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@dataclass(frozen=True)
+class Part:
+    name: str
+    solve: Callable[[ModuleType, Any], Any]
+
+
+@dataclass(frozen=True)
+class Day:
+    number: int
+    parts: Tuple[Part, ...]
+    parse: Callable[[ModuleType, str], Any] = field(default=lambda solution, path: solution.read_input(path))
+
+    @property
+    def directory(self) -> Path:
+        return ROOT / f'day_{self.number:02d}'
+
+    @property
+    def input_path(self) -> Path:
+        return self.directory / 'input.txt'
+
+    @property
+    def module_name(self) -> str:
+        return f'day_{self.number:02d}'
+
+    def part(self, name: str) -> Part:
+        for part in self.parts:
+            if part.name == name:
+                return part
+        raise KeyError(f'day {self.number} has no part {name}')
+
+
+def load_solution(day: Day) -> ModuleType:
+    if day.module_name in sys.modules:
+        return sys.modules[day.module_name]
+
+    spec = importlib.util.spec_from_file_location(day.module_name, day.directory / 'solution.py')
+    solution = importlib.util.module_from_spec(spec)
+    # registered before execution, so that module-level functions and classes can be pickled
+    sys.modules[day.module_name] = solution
+    try:
+        spec.loader.exec_module(solution)
+    except BaseException:
+        del sys.modules[day.module_name]
+        raise
+    return solution
+
+
+DAYS: Dict[int, Day] = {day.number: day for day in [
+    Day(4, (
+        Part('1', lambda solution, data: solution.task1(*data)),
+        Part('2', lambda solution, data: solution.task2(*data)),
+    )),
+    Day(5, (
+        Part('1', lambda solution, data: solution.task1(data)),
+        Part('2', lambda solution, data: solution.task2(data)),
+    )),
+    Day(6, (
+        Part('1', lambda solution, data: solution.task(data, 80)),
+        Part('2', lambda solution, data: solution.task(data, 256)),
+    )),
+    Day(7, (
+        Part('1', lambda solution, data: solution.task1(data)),
+        Part('2', lambda solution, data: solution.task2(data)),
+    )),
+    Day(8, (
+        Part('1', lambda solution, data: solution.task1(data)),
+        Part('2', lambda solution, data: solution.task2(data)),
+    )),
+    Day(9, (
+        Part('1', lambda solution, data: solution.Matrix(data).task1()),
+        Part('2', lambda solution, data: solution.Matrix(data).task2()),
+    )),
+    Day(10, (
+        Part('1', lambda solution, data: solution.task1(data)),
+        Part('2', lambda solution, data: solution.task2(data)),
+    )),
+    Day(11, (
+        Part('1', lambda solution, data: solution.task1(data, 100)),
+        Part('2', lambda solution, data: solution.task2(data)),
+    )),
+    Day(12, (
+        Part('1', lambda solution, data: solution.Graph(data).count_paths(allow_two_visits_for_single_small_cave=False)),
+        Part('2', lambda solution, data: solution.Graph(data).count_paths(allow_two_visits_for_single_small_cave=True)),
+    )),
+    Day(13, (
+        Part('1', lambda solution, data: solution.task1(*data)),
+        Part('2', lambda solution, data: solution.task2(*data)),
+    )),
+    Day(14, (
+        Part('1', lambda solution, data: solution.task(*data, 10)),
+        Part('2', lambda solution, data: solution.task(*data, 40)),
+    )),
+    Day(15, (
+        Part('1', lambda solution, data: solution.task1(data)),
+        Part('2', lambda solution, data: solution.task2(data)),
+    )),
+    Day(16, (
+        Part('1', lambda solution, data: solution.task1(data)),
+        Part('2', lambda solution, data: solution.task2(data)),
+    )),
+    Day(17, (
+        Part('1', lambda solution, data: solution.task1(solution.Range(data[2], data[3]))),
+        Part('2', lambda solution, data: solution.task2(solution.Range(data[0], data[1]), solution.Range(data[2], data[3]))),
+    )),
+    Day(18, (
+        Part('1', lambda solution, data: solution.task1(data)),
+        Part('2', lambda solution, data: solution.task2(data)),
+    )),
+    Day(20, (
+        Part('1', lambda solution, data: solution.task(*data, 2)),
+        Part('2', lambda solution, data: solution.task(*data, 50)),
+    )),
+    Day(24, (
+        Part('1', lambda solution, data: solution.Solution(data).max()),
+        Part('2', lambda solution, data: solution.Solution(data).min()),
+    )),
+]}
+
+
+def select_parts(selectors: Iterable[str]) -> List[Tuple[Day, Part]]:
+    """ Resolves selectors like '15' (all parts of day 15) or '15:2' (second part only); no selectors means all days. """
+    selectors = list(selectors)
+    if not selectors:
+        return [(day, part) for day in DAYS.values() for part in day.parts]
+
+    selected = []
+    for selector in selectors:
+        day_number, _, part_name = selector.partition(':')
+        day = DAYS[int(day_number)]
+        parts = [day.part(part_name)] if part_name else day.parts
+        selected.extend((day, part) for part in parts)
+    return selected
@@ -0,0 +1,344 @@
+import argparse
+import inspect
+import itertools
+import random
+import string
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from common.days import DAYS, ROOT, Day
+
+GENERATED_DIR = ROOT / '.generated'
+
+
+def digit_grid(rng: random.Random, height: int, width: int, digits: str) -> str:
+    return ''.join(''.join(rng.choices(digits, k=width)) + '\n' for _ in range(height))
+
+
+# day 4: `size` bingo boards
+def generate_day_04(rng: random.Random, size: int) -> str:
+    balls = list(range(100))
+    rng.shuffle(balls)
+    lines = [','.join(map(str, balls))]
+
+    for _ in range(size):
+        numbers = rng.sample(range(100), 25)
+        lines.append('')
+        lines.extend(' '.join(f'{num:>2}' for num in numbers[i: i + 5]) for i in range(0, 25, 5))
+
+    return '\n'.join(lines) + '\n'
+
+
+# day 5: `size` horizontal, vertical and diagonal vents with coordinates in [0, extent)
+def generate_day_05(rng: random.Random, size: int, extent: int = 1000) -> str:
+    lines = []
+
+    for _ in range(size):
+        x1, y1 = rng.randrange(extent), rng.randrange(extent)
+        kind = rng.randrange(3)
+        if kind == 0:
+            x2, y2 = rng.randrange(extent), y1
+        elif kind == 1:
+            x2, y2 = x1, rng.randrange(extent)
+        else:
+            dx, dy = rng.choice((-1, 1)), rng.choice((-1, 1))
+            max_length = min(x1 if dx < 0 else extent - 1 - x1, y1 if dy < 0 else extent - 1 - y1)
+            length = rng.randint(0, max_length)
+            x2, y2 = x1 + dx * length, y1 + dy * length
+        lines.append(f'{x1},{y1} -> {x2},{y2}\n')
+
+    return ''.join(lines)
+
+
+# day 6: `size` lanternfish
+def generate_day_06(rng: random.Random, size: int) -> str:
+    return ','.join(rng.choices('12345', k=size)) + '\n'
+
+
+# day 7: `size` crabs with positions in [0, span)
+def generate_day_07(rng: random.Random, size: int, span: int = 2000) -> str:
+    return ','.join(str(rng.randrange(span)) for _ in range(size)) + '\n'
+
+
+DIGIT_SEGMENTS = ['abcefg', 'cf', 'acdeg', 'acdfg', 'bcdf', 'abdfg', 'abdefg', 'acf', 'abcdefg', 'abcdfg']
+
+
+# day 8: `size` displays, each with its own random wiring
+def generate_day_08(rng: random.Random, size: int) -> str:
+    lines = []
+
+    for _ in range(size):
+        wiring = dict(zip('abcdefg', rng.sample('abcdefg', 7)))
+        scramble = lambda segments: ''.join(rng.sample([wiring[segment] for segment in segments], len(segments)))
+        patterns = [scramble(segments) for segments in rng.sample(DIGIT_SEGMENTS, 10)]
+        outputs = [scramble(rng.choice(DIGIT_SEGMENTS)) for _ in range(4)]
+        lines.append(f'{" ".join(patterns)} | {" ".join(outputs)}\n')
+
+    return ''.join(lines)
+
+
+# day 9: `size` x `size` heightmap, with 9s being roughly a fifth of all cells
+def generate_day_09(rng: random.Random, size: int) -> str:
+    return digit_grid(rng, size, size, '012345678899')
+
+
+# day 10: `size` navigation lines, roughly half of them corrupted and the rest incomplete
+def generate_day_10(rng: random.Random, size: int, length: int = 100) -> str:
+    opening, closing = '([{<', ')]}>'
+    lines = []
+
+    for _ in range(size):
+        corrupted = rng.random() < 0.5
+        stack, line = [], []
+        while len(line) < length or not stack:
+            if stack and rng.random() < 0.45:
+                line.append(closing[stack.pop()])
+            else:
+                stack.append(rng.randrange(4))
+                line.append(opening[stack[-1]])
+        if corrupted:
+            wrong = rng.choice([i for i in range(4) if i != stack[-1]])
+            line.append(closing[wrong])
+        lines.append(''.join(line) + '\n')
+
+    return ''.join(lines)
+
+
+# day 11: `size` x `size` octopus energy levels; unlike the puzzle inputs, larger random grids may never synchronise
+def generate_day_11(rng: random.Random, size: int) -> str:
+    return digit_grid(rng, size, size, string.digits)
+
+
+def cave_names(alphabet: str, count: int) -> List[str]:
+    for length in itertools.count(2):
+        names = [''.join(letters) for letters in itertools.product(alphabet, repeat=length)]
+        if len(names) >= count:
+            return names[:count]
+
+
+# day 12: cave system with `size` small caves and `density` percent as many extra links between small caves;
+# big caves are never connected to each other
+def generate_day_12(rng: random.Random, size: int, density: int = 30) -> str:
+    small = [name for name in cave_names(string.ascii_lowercase, size + 2) if name not in ('start', 'end')][:size]
+    big = cave_names(string.ascii_uppercase, max(1, size // 3))
+    edges = set()
+
+    for cave in small:
+        edges.add((cave, rng.choice(big)))
+    for _ in range(size * density // 100):
+        left, right = rng.sample(small, 2) if size > 1 else (small[0], big[0])
+        edges.add((left, right))
+    for terminal in ('start', 'end'):
+        for cave in rng.sample(small + big, min(3, len(small + big))):
+            edges.add((terminal, cave) if rng.random() < 0.5 else (cave, terminal))
+
+    return ''.join(f'{left}-{right}\n' for left, right in sorted(edges))
+
+
+# day 13: `size` dots on a sheet which folds down to a 39x6 code
+def generate_day_13(rng: random.Random, size: int, folds: int = 6) -> str:
+    width, height = 39, 6
+    fold_lines = []
+    for i in range(2 * folds):
+        if i % 2 == 0:
+            fold_lines.append(('x', width))
+            width = 2 * width + 1
+        else:
+            fold_lines.append(('y', height))
+            height = 2 * height + 1
+
+    # every dot of the code unfolds into a different dot for every choice of sides, so there are only this many
+    choices = 1 << len(fold_lines)
+    points = []
+    for index in rng.sample(range(39 * 6 * choices), min(size, 39 * 6 * choices)):
+        (x, y), sides = divmod(index // choices, 6), index % choices
+        for i, (axis, value) in enumerate(fold_lines):
+            if sides >> i & 1:
+                if axis == 'x':
+                    x = 2 * value - x
+                else:
+                    y = 2 * value - y
+        points.append((x, y))
+
+    lines = [f'{x},{y}\n' for x, y in points]
+    lines.append('\n')
+    lines.extend(f'fold along {axis}={value}\n' for axis, value in reversed(fold_lines))
+    return ''.join(lines)
+
+
+# day 14: polymer template of length `size`, with insertion rules for every pair of 10 elements
+def generate_day_14(rng: random.Random, size: int) -> str:
+    elements = rng.sample(string.ascii_uppercase, 10)
+    lines = [''.join(rng.choices(elements, k=size)), '']
+    lines.extend(f'{left}{right} -> {rng.choice(elements)}' for left, right in itertools.product(elements, repeat=2))
+    return '\n'.join(lines) + '\n'
+
+
+# day 15: `size` x `size` risk levels
+def generate_day_15(rng: random.Random, size: int) -> str:
+    return digit_grid(rng, size, size, '123456789')
+
+
+def packet_bits(rng: random.Random, packets: int) -> str:
+    version = format(rng.randrange(8), '03b')
+
+    if packets == 1:
+        value = rng.randrange(1 << 16)
+        groups = format(value, 'b')
+        groups = groups.zfill((len(groups) + 3) // 4 * 4)
+        chunks = [groups[i: i + 4] for i in range(0, len(groups), 4)]
+        return version + '100' + ''.join(('1' if i < len(chunks) - 1 else '0') + chunk for i, chunk in enumerate(chunks))
+
+    packet_type = rng.choice((0, 1, 2, 3, 5, 6, 7)) if packets >= 3 else rng.choice((0, 1, 2, 3))
+    if packet_type >= 5:
+        split = rng.randint(1, packets - 2)
+        budgets = [split, packets - 1 - split]
+    else:
+        count = rng.randint(1, min(packets - 1, 4))
+        cuts = sorted(rng.sample(range(1, packets - 1), count - 1))
+        budgets = [right - left for left, right in zip([0] + cuts, cuts + [packets - 1])]
+
+    subpackets = [packet_bits(rng, budget) for budget in budgets]
+    if rng.random() < 0.5 and sum(map(len, subpackets)) < (1 << 15):
+        header = '0' + format(sum(map(len, subpackets)), '015b')
+    else:
+        header = '1' + format(len(subpackets), '011b')
+    return version + format(packet_type, '03b') + header + ''.join(subpackets)
+
+
+# day 16: transmission with a single outermost packet containing `size` packets in total
+def generate_day_16(rng: random.Random, size: int) -> str:
+    bits = packet_bits(rng, size)
+    bits += '0' * (-len(bits) % 4)
+    return ''.join(f'{int(bits[i: i + 4], 2):X}' for i in range(0, len(bits), 4)) + '\n'
+
+
+# day 17: target area roughly `size` units away from the launcher
+def generate_day_17(rng: random.Random, size: int) -> str:
+    x1 = rng.randint(size, 2 * size)
+    y1 = -rng.randint(size, 2 * size)
+    x2 = x1 + rng.randint(size // 4, size // 2)
+    y2 = y1 + rng.randint(size // 4, size // 2)
+    return f'target area: x={x1}..{x2}, y={y1}..{y2}\n'
+
+
+def snailfish_number(rng: random.Random, depth: int) -> str:
+    if depth == 4 or (depth > 0 and rng.random() < 0.3):
+        return str(rng.randrange(10))
+    return f'[{snailfish_number(rng, depth + 1)},{snailfish_number(rng, depth + 1)}]'
+
+
+# day 18: `size` reduced snailfish numbers
+def generate_day_18(rng: random.Random, size: int) -> str:
+    return ''.join(snailfish_number(rng, 0) + '\n' for _ in range(size))
+
+
+# day 20: `size` x `size` input image with a random enhancement algorithm
+def generate_day_20(rng: random.Random, size: int) -> str:
+    algorithm = ''.join(rng.choices('#.', k=512))
+    return algorithm + '\n\n' + digit_grid(rng, size, size, '#.')
+
+
+def alu_block(div: int, check: int, offset: int) -> str:
+    return (
+        'inp w\nmul x 0\nadd x z\nmod x 26\n'
+        f'div z {div}\nadd x {check}\n'
+        'eql x w\neql x 0\nmul y 0\nadd y 25\nmul y x\nadd y 1\nmul z y\nmul y 0\nadd y w\n'
+        f'add y {offset}\nmul y x\nadd z y\n'
+    )
+
+
+# day 24: MONAD-like program for `size` digit model numbers, `size` is even
+def generate_day_24(rng: random.Random, size: int = 14) -> str:
+    blocks = []
+    pushed: List[int] = []
+    pushes_left = size // 2
+
+    for i in range(size):
+        remaining = size - i
+        if pushed and (pushes_left == 0 or len(pushed) == remaining or rng.random() < 0.5):
+            # popping block compares its digit to the pushed digit + offset, which must be reachable with digits 1..9
+            offset = pushed.pop()
+            blocks.append(alu_block(26, rng.randint(-8, 8) - offset, rng.randint(1, 16)))
+        else:
+            offset = rng.randint(1, 16)
+            pushed.append(offset)
+            pushes_left -= 1
+            blocks.append(alu_block(1, rng.randint(10, 16), offset))
+
+    return ''.join(blocks)
+
+
+GENERATORS: Dict[int, Callable[..., str]] = {
+    4: generate_day_04,
+    5: generate_day_05,
+    6: generate_day_06,
+    7: generate_day_07,
+    8: generate_day_08,
+    9: generate_day_09,
+    10: generate_day_10,
+    11: generate_day_11,
+    12: generate_day_12,
+    13: generate_day_13,
+    14: generate_day_14,
+    15: generate_day_15,
+    16: generate_day_16,
+    17: generate_day_17,
+    18: generate_day_18,
+    20: generate_day_20,
+    24: generate_day_24,
+}
+
+
+def generate(day: Day, size: int, seed: int = 0, **params: int) -> str:
+    return GENERATORS[day.number](random.Random(seed), size, **params)
+
+
+def generated_input(day: Day, size: int, seed: int = 0, **params: int) -> Path:
+    """ Writes the generated input once and reuses it afterwards, as the same seed always gives the same input. """
+    # defaults are part of the name too, so that changing one never reuses an input generated with the old value
+    parameters = list(inspect.signature(GENERATORS[day.number]).parameters.values())[2:]
+    defaults = {parameter.name: parameter.default for parameter in parameters}
+    suffix = ''.join(f'_{name}{value}' for name, value in sorted({**defaults, **params}.items()))
+    path = GENERATED_DIR / f'{day.directory.name}_size{size}_seed{seed}{suffix}.txt'
+
+    if not path.exists():
+        GENERATED_DIR.mkdir(exist_ok=True)
+        partial = path.with_suffix('.tmp')
+        partial.write_text(generate(day, size, seed, **params))
+        partial.replace(path)
+
+    return path
+
+
+def input_path(day: Day, size: Optional[int] = None, seed: int = 0, params: Optional[Dict[str, int]] = None) -> Path:
+    if size is None:
+        return day.input_path
+    return generated_input(day, size, seed, **(params or {}))
+
+
+def parse_params(params: List[str]) -> Dict[str, int]:
+    pairs: List[Tuple[str, str]] = [param.split('=', 1) for param in params]
+    return {name: int(value) for name, value in pairs}
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--generate', type=int, metavar='SIZE', help='use a generated input of this size instead of input.txt')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the generated input')
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=VALUE', help='extra generator parameter')
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Generates inputs of a given size for the 2021 solutions.')
+    parser.add_argument('day', type=int, choices=sorted(GENERATORS))
+    parser.add_argument('size', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=VALUE', help='extra generator parameter')
+    parser.add_argument('--output', help='file to write, stdout by default')
+    args = parser.parse_args(argv)
+
+    text = generate(DAYS[args.day], args.size, args.seed, **parse_params(args.param))
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text, end='')
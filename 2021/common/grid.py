@@ -0,0 +1,60 @@
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+Delta = Tuple[int, int]
+
+ORTHOGONAL: Tuple[Delta, ...] = ((-1, 0), (0, -1), (0, 1), (1, 0))
+ADJACENT: Tuple[Delta, ...] = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+# 3x3 square around a cell in reading order, including the cell itself
+SQUARE: Tuple[Delta, ...] = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 0), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+class Grid:
+    """ Rectangular grid of small non-negative integers, stored as a contiguous uint8 array. """
+
+    cells: np.ndarray
+
+    def __init__(self, cells: np.ndarray):
+        self.cells = np.ascontiguousarray(cells, dtype=np.uint8)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Iterable[int]]) -> 'Grid':
+        return cls(np.array([list(row) for row in rows], dtype=np.uint8))
+
+    @property
+    def n(self) -> int:
+        return self.cells.shape[0]
+
+    @property
+    def m(self) -> int:
+        return self.cells.shape[1]
+
+    def __getitem__(self, key):
+        return self.cells[key]
+
+    def __setitem__(self, key, value):
+        self.cells[key] = value
+
+    def copy(self) -> 'Grid':
+        return Grid(self.cells.copy())
+
+    def padded(self, width: int, fill: int) -> np.ndarray:
+        return np.pad(self.cells, width, mode='constant', constant_values=fill)
+
+    def neighbour_views(self, deltas: Sequence[Delta], fill: int) -> List[np.ndarray]:
+        """ For every delta, a view whose cell (x, y) holds cell (x + dx, y + dy), or `fill` outside the grid. """
+        width = max(max(abs(dx), abs(dy)) for dx, dy in deltas)
+        padded = self.padded(width, fill)
+        return [padded[width + dx: width + dx + self.n, width + dy: width + dy + self.m] for dx, dy in deltas]
+
+    def coordinates(self) -> Iterator[Tuple[int, int]]:
+        for x in range(self.n):
+            for y in range(self.m):
+                yield x, y
+
+    def neighbours(self, x: int, y: int, deltas: Sequence[Delta] = ORTHOGONAL) -> Iterator[Tuple[int, int]]:
+        for dx, dy in deltas:
+            i, j = x + dx, y + dy
+            if 0 <= i < self.n and 0 <= j < self.m:
+                yield i, j
@@ -0,0 +1,86 @@
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from common.days import DAYS, ROOT, Day
+
+MARKER = '--- loading solutions'
+
+LOAD_SCRIPT = f'''
+import sys, time
+from common.days import DAYS, load_solution
+sys.stderr.write({MARKER!r} + '\\n')
+start = time.perf_counter()
+for number in sys.argv[1:]:
+    load_solution(DAYS[int(number)])
+sys.stderr.write(f'--- total {{time.perf_counter() - start}}\\n')
+'''
+
+
+@dataclass
+class ImportReport:
+    total: float
+    imports: List[Tuple[str, float]]
+    error: Optional[str] = None
+
+
+def measure_imports(days: List[Day]) -> ImportReport:
+    """ Loads the solutions in a fresh interpreter with -X importtime, so nothing is imported yet. """
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', LOAD_SCRIPT, *(str(day.number) for day in days)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    lines = process.stderr.splitlines()
+
+    if process.returncode != 0:
+        return ImportReport(0.0, [], lines[-1] if lines else f'exit code {process.returncode}')
+
+    imports = []
+    total = 0.0
+    for line in lines[lines.index(MARKER) + 1:]:
+        if line.startswith('--- total '):
+            total = float(line.split()[-1])
+        elif line.startswith('import time:') and '|' in line:
+            # "import time: self [us] | cumulative | imported package", nested imports are indented
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if not name.startswith('  '):
+                imports.append((name.strip(), int(cumulative) / 1e6))
+
+    return ImportReport(total, imports)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Reports the cold import time of the 2021 solutions.')
+    parser.add_argument('days', nargs='*', type=int, help='days to report, all by default')
+    parser.add_argument('--top', type=int, default=3, help='number of the slowest imports to show per day')
+    parser.add_argument('--budget', type=float, metavar='MS', help='fail if loading any single day takes longer')
+    args = parser.parse_args(argv)
+
+    days = [DAYS[number] for number in args.days] if args.days else list(DAYS.values())
+    over_budget = []
+
+    print(f'{"day":>3}  {"load":>9}  slowest imports')
+    for day in days:
+        report = measure_imports([day])
+        if report.error is not None:
+            print(f'{day.number:>3}  {"ERROR":>9}  {report.error}')
+            continue
+
+        slowest = sorted(report.imports, key=lambda entry: -entry[1])[:args.top]
+        details = ', '.join(f'{name} {seconds * 1000:.1f}ms' for name, seconds in slowest)
+        print(f'{day.number:>3}  {report.total * 1000:>7.1f}ms  {details}')
+
+        if args.budget is not None and report.total * 1000 > args.budget:
+            over_budget.append(day.number)
+
+    together = measure_imports(days)
+    if together.error is None:
+        print(f'all days in one process: {together.total * 1000:.1f}ms')
+
+    if over_budget:
+        print(f'over the {args.budget}ms budget: {", ".join(map(str, over_budget))}')
+        sys.exit(1)
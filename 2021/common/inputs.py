@@ -0,0 +1,79 @@
+import contextlib
+import mmap
+import os
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+@contextlib.contextmanager
+def mapped(path: str) -> Iterator[Union[mmap.mmap, bytes]]:
+    """ Read-only memory map of the whole file; nothing sliced out of it may outlive the `with` block. """
+    with open(path, 'rb') as reader:
+        if os.fstat(reader.fileno()).st_size == 0:
+            # empty files cannot be mapped, but empty bytes support the same reading operations
+            yield b''
+            return
+        with mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            yield mapping
+
+
+def lines(path: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Lines of the file without line endings, read one at a time from the memory map. With `start` and `end`, only
+    the lines that begin within that byte range are read.
+    """
+    with mapped(path) as mapping:
+        size = len(mapping) if end is None else min(end, len(mapping))
+        while start < size:
+            stop = mapping.find(b'\n', start)
+            if stop == -1:
+                stop = len(mapping)
+            line = mapping[start: stop]
+            yield line[:-1] if line.endswith(b'\r') else line
+            start = stop + 1
+
+
+def line_ranges(path: str, count: int) -> List[Tuple[int, int]]:
+    """ Splits the file into at most `count` byte ranges of similar size, each starting at the beginning of a line. """
+    with mapped(path) as mapping:
+        size = len(mapping)
+        bounds = [0]
+        for i in range(1, count):
+            stop = mapping.find(b'\n', max(size * i // count, bounds[-1]))
+            if stop == -1:
+                break
+            bounds.append(stop + 1)
+        bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def text_lines(path: str) -> Iterator[str]:
+    return (line.decode() for line in lines(path))
+
+
+# numpy is only imported by the grid readers below, so that days reading text lines do not pay for loading it
+def digits(data: 'np.ndarray', stride: int, width: int) -> 'np.ndarray':
+    import numpy as np
+
+    rows, rest = divmod(len(data), stride)
+    grid = data[:rows * stride].reshape(rows, stride)[:, :width]
+    if rest >= width:
+        # the last line has no line ending
+        grid = np.concatenate([grid, data[rows * stride: rows * stride + width].reshape(1, width)])
+    # unless the last line ending is missing, every step before only creates views and this is the only copy
+    return grid - np.uint8(ord('0'))
+
+
+def digit_grid(path: str) -> 'np.ndarray':
+    """ Parses a rectangle of digits, one row per line, straight from the file bytes into a uint8 array. """
+    import numpy as np
+
+    with mapped(path) as mapping:
+        stride = mapping.find(b'\n') + 1
+        if stride == 0:
+            stride = len(mapping) + 1
+        width = stride - 2 if mapping[stride - 2: stride - 1] == b'\r' else stride - 1
+        # the views of the mapping only live until `digits` returns, so the mapping can be closed afterwards
+        return digits(np.frombuffer(mapping, dtype=np.uint8), stride, width)
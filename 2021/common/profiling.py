@@ -0,0 +1,132 @@
+import cProfile
+import collections
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable, Counter, Dict, List, Optional, Tuple
+
+from common.days import ROOT
+
+PROFILE_DIR = ROOT / '.profiles'
+MODES = ('cprofile', 'sampling')
+
+FunctionKey = Tuple[str, int, str]
+
+
+def peak_memory(action: Callable[[], Any]) -> int:
+    """ Peak size in bytes of the Python allocations made while running `action`. """
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        action()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def frame_name(filename: str, line: int, function: str) -> str:
+    # semicolons separate frames in the collapsed format, so they must not appear in frame names
+    return f'{Path(filename).parent.name}/{Path(filename).name}:{function}:{line}'.replace(';', ',')
+
+
+def write_collapsed(path: Path, stacks: Counter[Tuple[str, ...]]):
+    with open(path, 'w') as writer:
+        for stack, weight in sorted(stacks.items()):
+            if weight > 0:
+                writer.write(f'{";".join(stack)} {weight}\n')
+
+
+def collapse_cprofile(stats: pstats.Stats) -> Counter[Tuple[str, ...]]:
+    """
+    Approximates collapsed stacks from cProfile, which only records caller-callee pairs: the time of every function
+    is split between the stacks it was called from in proportion to the time of each caller-callee pair.
+    Weights are in microseconds.
+    """
+    entries: Dict[FunctionKey, tuple] = stats.stats
+    callees: Dict[FunctionKey, List[FunctionKey]] = collections.defaultdict(list)
+    for function, (_, _, _, _, callers) in entries.items():
+        for caller in callers:
+            callees[caller].append(function)
+
+    stacks = collections.Counter()
+
+    def visit(function: FunctionKey, time: float, stack: Tuple[str, ...]):
+        _, _, own_time, total_time, _ = entries[function]
+        stack = stack + (frame_name(*function),)
+        scale = time / total_time if total_time > 0 else 0.0
+        stacks[stack] += round(own_time * scale * 1e6)
+
+        for callee in callees[function]:
+            if frame_name(*callee) in stack or len(stack) > 128:
+                continue
+            edge_time = entries[callee][4][function][3]
+            visit(callee, edge_time * scale, stack)
+
+    for function, (_, _, _, total_time, callers) in entries.items():
+        if not callers:
+            visit(function, total_time, ())
+
+    return stacks
+
+
+def run_cprofile(action: Callable[[], Any], output: Path) -> Any:
+    profiler = cProfile.Profile()
+    result = profiler.runcall(action)
+
+    profiler.dump_stats(output.with_suffix('.prof'))
+    write_collapsed(output.with_suffix('.collapsed'), collapse_cprofile(pstats.Stats(profiler)))
+    return result
+
+
+class Sampler(threading.Thread):
+    """ Records the stack of a thread every `interval` seconds. """
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame: Optional[FrameType] = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(frame_name(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            # the sampled thread also runs this module, which is not part of the profiled code
+            self.stacks[tuple(name for name in reversed(stack) if 'profiling.py' not in name)] += 1
+
+
+def run_sampling(action: Callable[[], Any], output: Path, interval: float = 0.001) -> Any:
+    switch_interval = sys.getswitchinterval()
+    # the sampler only runs when it gets the GIL, so the profiled thread has to give it up often enough
+    sys.setswitchinterval(interval / 2)
+    sampler = Sampler(threading.get_ident(), interval)
+    sampler.start()
+
+    try:
+        result = action()
+    finally:
+        sampler.stopped.set()
+        sampler.join()
+        sys.setswitchinterval(switch_interval)
+
+    write_collapsed(output.with_suffix('.collapsed'), sampler.stacks)
+    return result
+
+
+def profile(action: Callable[[], Any], mode: str, output: Path) -> Any:
+    """ Runs `action` under the given profiler and writes the results to files named `output` with new suffixes. """
+    os.makedirs(output.parent, exist_ok=True)
+    if mode == 'cprofile':
+        return run_cprofile(action, output)
+    if mode == 'sampling':
+        return run_sampling(action, output)
+    raise ValueError(f'unknown profiling mode {mode}')
@@ -0,0 +1,148 @@
+import argparse
+import concurrent.futures
+import copy
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from common import generators, profiling
+from common.cache import Cache
+from common.days import DAYS, load_solution, select_parts
+
+
+@dataclass
+class PartResult:
+    day: int
+    part: str
+    answer: Optional[str] = None
+    error: Optional[str] = None
+    import_time: float = 0.0
+    parse_time: float = 0.0
+    solve_time: float = 0.0
+    cached: bool = False
+    peak_memory: Optional[int] = None
+
+    @property
+    def total_time(self) -> float:
+        return self.import_time + self.parse_time + self.solve_time
+
+
+def run_part(
+        day_number: int,
+        part_name: str,
+        input_path: Optional[str] = None,
+        cache: Optional[Cache] = None,
+        profile_mode: Optional[str] = None
+) -> PartResult:
+    day = DAYS[day_number]
+    part = day.part(part_name)
+    path = input_path or str(day.input_path)
+    result = PartResult(day_number, part_name)
+
+    try:
+        if cache is not None:
+            answer_key = cache.key(day, path, f'answer{part_name}')
+            answer = cache.get(answer_key)
+            if answer is not None:
+                result.answer = answer
+                result.cached = True
+                return result
+
+        start = time.perf_counter()
+        solution = load_solution(day)
+        loaded = time.perf_counter()
+        data = cache.get(cache.key(day, path, 'parsed')) if cache is not None else None
+        if data is None:
+            data = day.parse(solution, path)
+            if cache is not None:
+                cache.put(cache.key(day, path, 'parsed'), data)
+        parsed = time.perf_counter()
+        if profile_mode is None:
+            solving = parsed
+            answer = part.solve(solution, data)
+        else:
+            # measured on a copy in a run of its own, so that tracing allocations does not skew the profile
+            memory_data = copy.deepcopy(data)
+            result.peak_memory = profiling.peak_memory(lambda: part.solve(solution, memory_data))
+            output = profiling.PROFILE_DIR / f'{day.directory.name}_part_{part_name}_{profile_mode}'
+            solving = time.perf_counter()
+            answer = profiling.profile(lambda: part.solve(solution, data), profile_mode, output)
+        solved = time.perf_counter()
+    except Exception:
+        result.error = traceback.format_exc(limit=-1).strip().splitlines()[-1]
+        return result
+
+    result.answer = str(answer).strip()
+    result.import_time = loaded - start
+    result.parse_time = parsed - loaded
+    result.solve_time = solved - solving
+
+    if cache is not None:
+        cache.put(answer_key, result.answer)
+
+    return result
+
+
+def run_parts(
+        selectors: List[str],
+        workers: Optional[int] = None,
+        serial: bool = False,
+        size: Optional[int] = None,
+        seed: int = 0,
+        params: Optional[Dict[str, int]] = None,
+        cache: Optional[Cache] = None,
+        profile_mode: Optional[str] = None
+) -> List[PartResult]:
+    selected = select_parts(selectors)
+    # generated before starting the workers, so that every input is written exactly once
+    paths = {day.number: str(generators.input_path(day, size, seed, params)) for day, _ in selected}
+
+    if serial:
+        return [run_part(day.number, part.name, paths[day.number], cache, profile_mode) for day, part in selected]
+
+    # every part is parsed in its own worker, as some tasks mutate the parsed input
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_part, day.number, part.name, paths[day.number], cache, profile_mode) for day, part in selected]
+        return [future.result() for future in futures]
+
+
+def print_results(results: List[PartResult], wall_time: float):
+    print(f'{"day":>3} {"part":>4}  {"import":>9} {"parse":>9} {"solve":>9}  answer')
+    for result in results:
+        answer = result.answer if result.error is None else f'ERROR: {result.error}'
+        if result.cached:
+            answer += ' (cached)'
+        if result.peak_memory is not None:
+            answer += f' (peak memory {result.peak_memory / (1 << 20):.1f}MB)'
+        print(
+            f'{result.day:>3} {result.part:>4}  '
+            f'{result.import_time * 1000:>7.1f}ms {result.parse_time * 1000:>7.1f}ms {result.solve_time * 1000:>7.1f}ms  '
+            f'{answer}'
+        )
+
+    slowest = max((result.total_time for result in results), default=0.0)
+    total = sum(result.total_time for result in results)
+    print(f'wall time {wall_time:.2f}s, slowest part {slowest:.2f}s, sum of parts {total:.2f}s')
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Runs the 2021 solutions in parallel.')
+    parser.add_argument('selectors', nargs='*', metavar='DAY[:PART]', help='days or parts to run, all by default')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--serial', action='store_true', help='run everything in this process, one part at a time')
+    parser.add_argument('--no-cache', action='store_true', help='ignore and do not store cached inputs and answers')
+    parser.add_argument('--cache-size', type=int, default=256, metavar='MB', help='size limit of the on-disk cache')
+    parser.add_argument(
+        '--profile',
+        choices=profiling.MODES,
+        help=f'profile the selected parts and record their peak memory, results are written to {profiling.PROFILE_DIR}'
+    )
+    generators.add_arguments(parser)
+    args = parser.parse_args(argv)
+    # profiling needs the parts to actually run
+    cache = None if args.no_cache or args.profile else Cache(max_bytes=args.cache_size << 20)
+
+    start = time.perf_counter()
+    results = run_parts(args.selectors, args.workers, args.serial, args.generate, args.seed, generators.parse_params(args.param), cache, args.profile)
+    print_results(results, time.perf_counter() - start)
@@ -1,6 +1,13 @@
-import math
+import sys
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from common import inputs  # noqa: E402
 
 
 @dataclass(order=True)
@@ -9,46 +16,140 @@ class Ball:
     num: int
 
 
-class Board:
-    def __init__(self, lines: List[str]):
-        self.board = [[int(num) for num in line.split()] for line in lines]
-
-    def as_timing_board(self, ball_times: Dict[int, int]) -> List[List[Ball]]:
-        return [[Ball(ball_times.get(num, math.inf), num) for num in row] for row in self.board]
+class Boards:
+    """ All boards stacked into a single array, so that every board is scored at once. """
 
-    def winning_time_and_score(self, ball_times: Dict[int, int]) -> Tuple[int, int]:
-        timing_board = self.as_timing_board(ball_times)
-        rows = min(max(timing_board[i]) for i in range(5))
-        cols = min(max(timing_board[i][j] for i in range(5)) for j in range(5))
-        winning_ball = min(rows, cols)
+    def __init__(self, boards: np.ndarray):
+        # laid out as (row, column, board), so that reducing over rows or columns works on long contiguous vectors
+        self.cells = np.ascontiguousarray(boards.reshape(-1, 5, 5).transpose(1, 2, 0))
 
-        unmarked = sum(ball.num for row in timing_board for ball in row if ball.time > winning_ball.time)
+    def __len__(self) -> int:
+        return self.cells.shape[2]
 
-        return winning_ball.time, unmarked * winning_ball.num
+    def timing_boards(self, balls: List[Ball]) -> np.ndarray:
+        # numbers that are never drawn get a time after the last ball
+        never = len(balls)
+        nums = np.array([ball.num for ball in balls], dtype=np.int64)
+        times = np.array([ball.time for ball in balls], dtype=np.int64)
+        ball_times = np.full(max(int(self.cells.max()), int(nums.max())) + 1, never, dtype=np.int64)
+        # with repeated numbers the last assignment wins, so assigning in reverse keeps the earliest time
+        ball_times[nums[::-1]] = times[::-1]
+        return ball_times[self.cells]
 
+    def winning_times_and_scores(self, balls: List[Ball]) -> Tuple[np.ndarray, np.ndarray]:
+        """ For every board, the time of the ball that completes its first row or column, and its score. """
+        timing_boards = self.timing_boards(balls)
+        rows = timing_boards.max(axis=1).min(axis=0)
+        cols = timing_boards.max(axis=0).min(axis=0)
+        winning_times = np.minimum(rows, cols)
 
-def read_input() -> Tuple[List[Ball], List[Board]]:
-    with open('input.txt', 'r') as reader:
-        stripped_lines = map(lambda line: line.strip(), reader.readlines())
-        non_empty_lines = filter(lambda line: line, stripped_lines)
-        lines = list(non_empty_lines)
+        unmarked = np.where(timing_boards > winning_times, self.cells, 0).sum(axis=(0, 1))
+        # boards that never win have no unmarked numbers left after the last ball, so their score is 0
+        winning_nums = np.array([ball.num for ball in balls] + [0], dtype=np.int64)
 
-        balls = [Ball(t, int(num)) for t, num in enumerate(lines[0].split(','))]
-        boards = [Board(lines[i - 5: i]) for i in range(6, len(lines) + 1, 5)]
+        return winning_times, unmarked * winning_nums[winning_times]
 
-        return balls, boards
 
-
-def task1(balls: List[Ball], boards: List[Board]) -> int:
-    ball_times = {ball.num: ball.time for ball in balls}
-    results = [board.winning_time_and_score(ball_times) for board in boards]
-    return min(results)[1]
-
-
-def task2(balls: List[Ball], boards: List[Board]) -> int:
-    ball_times = {ball.num: ball.time for ball in balls}
-    results = [board.winning_time_and_score(ball_times) for board in boards]
-    return max(results)[1]
+@dataclass
+class Winner:
+    board: int
+    time: int
+    score: int
+
+
+class Bingo:
+    """
+    Draws balls one at a time. Every number knows the cells it appears in, and every row and column of every board
+    counts its marked cells, so a ball only touches the cells with its number.
+    """
+
+    def __init__(self, boards: Boards):
+        count = len(boards)
+        flat = boards.cells.reshape(-1)
+        # flat index of the cell (row, column, board) is (row * 5 + column) * count + board
+        order = np.lexsort((np.arange(len(flat)) % count, flat))
+        nums, starts = np.unique(flat[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        # cells of every number, ordered by board
+        self.cells_by_num = {
+            int(num): (order[start: end] % count, order[start: end] // (5 * count), order[start: end] // count % 5)
+            for num, start, end in zip(nums, starts, ends)
+        }
+
+        self.row_marks = np.zeros((count, 5), dtype=np.int8)
+        self.col_marks = np.zeros((count, 5), dtype=np.int8)
+        self.unmarked = boards.cells.sum(axis=(0, 1))
+        self.won = np.zeros(count, dtype=bool)
+        self.drawn = set()
+
+        self.time = 0
+        self.winners: List[Winner] = []
+        # winner_counts[k] is the number of boards that have won after the first k balls
+        self.winner_counts = [0]
+
+    def draw(self, num: int) -> List[Winner]:
+        """ Marks the number on every board and returns the boards that won with it, in board order. """
+        new_winners = []
+
+        if num not in self.drawn and num in self.cells_by_num:
+            self.drawn.add(num)
+            board, row, col = self.cells_by_num[num]
+
+            repeated = board[1:] == board[:-1]
+            if not repeated.any():
+                self.unmarked[board] -= num
+                self.row_marks[board, row] += 1
+                self.col_marks[board, col] += 1
+            else:
+                # the number appears more than once on some board, which plain fancy indexing would count once
+                np.subtract.at(self.unmarked, board, num)
+                np.add.at(self.row_marks, (board, row), 1)
+                np.add.at(self.col_marks, (board, col), 1)
+
+            completed = (self.row_marks[board, row] == 5) | (self.col_marks[board, col] == 5)
+            winning_boards = board[completed & ~self.won[board]]
+            if repeated.any():
+                winning_boards = np.unique(winning_boards)
+            self.won[winning_boards] = True
+
+            new_winners = [
+                Winner(int(winner), self.time, int(self.unmarked[winner]) * num)
+                for winner in winning_boards
+            ]
+
+        self.winners.extend(new_winners)
+        self.winner_counts.append(len(self.winners))
+        self.time += 1
+        return new_winners
+
+    def winners_after(self, balls: int) -> List[Winner]:
+        """ Boards that have won with the first `balls` balls, in the order they won. """
+        return self.winners[:self.winner_counts[balls]]
+
+    def kth_winner(self, k: int) -> Optional[Winner]:
+        """ The k-th board to win, counting from 0, or None if fewer boards have won so far. """
+        return self.winners[k] if k < len(self.winners) else None
+
+
+def read_input(path: str = 'input.txt') -> Tuple[List[Ball], Boards]:
+    with inputs.mapped(path) as mapping:
+        end = mapping.find(b'\n')
+        balls = [Ball(t, int(num)) for t, num in enumerate(mapping[:end].split(b','))]
+        boards = Boards(np.fromstring(mapping[end + 1:], dtype=np.int64, sep=' '))
+
+    return balls, boards
+
+
+def task1(balls: List[Ball], boards: Boards) -> int:
+    times, scores = boards.winning_times_and_scores(balls)
+    # same as the smallest (time, score) pair
+    return int(scores[np.lexsort((scores, times))[0]])
+
+
+def task2(balls: List[Ball], boards: Boards) -> int:
+    times, scores = boards.winning_times_and_scores(balls)
+    # same as the largest (time, score) pair
+    return int(scores[np.lexsort((scores, times))[-1]])
 
 
 if __name__ == '__main__':
@@ -1,12 +1,24 @@
+import bisect
 import collections
+import itertools
+import sys
 from dataclasses import dataclass
-from typing import Iterator, List
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 
-def between(start: int, end: int) -> Iterator[int]:
-    inclusive_end = end + 1 if start < end else end - 1
-    step = 1 if start < end else -1
-    return range(start, inclusive_end, step)
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from common import inputs  # noqa: E402
+
+# the dense engine is used while the grid spanned by the lines has at most this many cells
+DENSE_CELLS = 1 << 22
+
+# coefficients (a, b) of the linear form a * x + b * y
+Form = Tuple[int, int]
+Segment = Tuple[int, int, int]
+Intervals = Dict[int, List[Tuple[int, int]]]
 
 
 @dataclass(eq=True, frozen=True)
@@ -20,15 +32,6 @@ class Line:
     p1: Point
     p2: Point
 
-    def integer_points(self) -> Iterator[Point]:
-        if self.is_vertical:
-            return (Point(self.p1.x, y) for y in between(self.p1.y, self.p2.y))
-
-        if self.is_horizontal:
-            return (Point(x, self.p1.y) for x in between(self.p1.x, self.p2.x))
-
-        return (Point(x, y) for x, y in zip(between(self.p1.x, self.p2.x), between(self.p1.y, self.p2.y)))
-
     @property
     def is_horizontal(self) -> bool:
         return self.p1.y == self.p2.y
@@ -38,35 +41,242 @@ class Line:
         return self.p1.x == self.p2.x
 
 
-def parse_line(line: str) -> Line:
-    start, end = line.split(' -> ')
-    x1, y1 = start.split(',')
-    x2, y2 = end.split(',')
+def parse_line(line: bytes) -> Line:
+    start, end = line.split(b' -> ')
+    x1, y1 = start.split(b',')
+    x2, y2 = end.split(b',')
     return Line(Point(int(x1), int(y1)), Point(int(x2), int(y2)))
 
 
-def read_input() -> List[Line]:
-    with open('input.txt', 'r') as reader:
-        return [parse_line(line) for line in reader.readlines()]
+def read_input(path: str = 'input.txt') -> List[Line]:
+    return [parse_line(line) for line in inputs.lines(path) if line]
 
 
-def task1(lines: List[Line]) -> int:
-    counter = collections.Counter()
+def as_array(lines: List[Line], diagonals: bool) -> np.ndarray:
+    """ Lines as rows of (x1, y1, x2, y2), without the diagonal ones unless `diagonals` is set. """
+    segments = np.array([(line.p1.x, line.p1.y, line.p2.x, line.p2.y) for line in lines], dtype=np.int64).reshape(-1, 4)
+    if not diagonals:
+        segments = segments[(segments[:, 0] == segments[:, 2]) | (segments[:, 1] == segments[:, 3])]
+    return segments
 
-    for line in lines:
-        if line.is_vertical or line.is_horizontal:
-            counter.update(line.integer_points())
 
-    return sum(1 for count in counter.values() if count > 1)
+def lengths(segments: np.ndarray) -> np.ndarray:
+    x1, y1, x2, y2 = segments.T
+    # lines are horizontal, vertical or at 45 degrees, so both coordinates change by at most 1 per step
+    return np.maximum(np.abs(x2 - x1), np.abs(y2 - y1)) + 1
 
 
-def task2(lines: List[Line]) -> int:
-    counter = collections.Counter()
+def cells(segments: np.ndarray, width: int) -> np.ndarray:
+    """ Flat index y * width + x of every point of every line. """
+    x1, y1, x2, y2 = segments.T
+    dx, dy = np.sign(x2 - x1), np.sign(y2 - y1)
+    counts = lengths(segments)
+
+    # offset of every point from the start of its own line
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    xs = np.repeat(x1, counts) + np.repeat(dx, counts) * offsets
+    ys = np.repeat(y1, counts) + np.repeat(dy, counts) * offsets
+    return ys * width + xs
+
+
+def rasterize(segments: np.ndarray) -> np.ndarray:
+    """ Number of lines covering every point of the smallest grid that contains all of them. """
+    width = int(segments[:, [0, 2]].max(initial=0)) + 1
+    height = int(segments[:, [1, 3]].max(initial=0)) + 1
+    counts = np.zeros(width * height, dtype=np.int64)
+
+    # expanding lines takes several arrays as long as the number of their points, so they are expanded in batches
+    # of about as many points as the grid has cells, which keeps memory proportional to the grid
+    batch = max(width * height, 1 << 16)
+    ends = np.cumsum(lengths(segments))
+    start = 0
+    while start < len(segments):
+        covered = int(ends[start - 1]) if start > 0 else 0
+        stop = max(int(np.searchsorted(ends, covered + batch, side='right')), start + 1)
+        counts += np.bincount(cells(segments[start: stop], width), minlength=width * height)
+        start = stop
+
+    return counts.reshape(height, width)
+
+
+def apply(form: Form, x: int, y: int) -> int:
+    return form[0] * x + form[1] * y
+
+
+def solve(first: Form, second: Form, a: int, b: int) -> Optional[Tuple[int, int]]:
+    """ The integer point p with first(p) == a and second(p) == b, if there is one. """
+    det = first[0] * second[1] - first[1] * second[0]
+    x, x_rest = divmod(a * second[1] - first[1] * b, det)
+    y, y_rest = divmod(first[0] * b - second[0] * a, det)
+    return (x, y) if x_rest == y_rest == 0 else None
+
+
+@dataclass(frozen=True)
+class Family:
+    """ Lines of one direction: `key` is constant along each of them and `position` tells their points apart. """
+    name: str
+    key: Form
+    position: Form
+
+    def segment(self, line: Line) -> Segment:
+        start = apply(self.position, line.p1.x, line.p1.y)
+        end = apply(self.position, line.p2.x, line.p2.y)
+        return apply(self.key, line.p1.x, line.p1.y), min(start, end), max(start, end)
+
+    def point(self, key: int, position: int) -> Tuple[int, int]:
+        # the key and position forms of every family have a determinant of +-1, so this point always exists
+        return solve(self.key, self.position, key, position)
+
+
+FAMILIES = (
+    Family('horizontal', key=(0, 1), position=(1, 0)),
+    Family('vertical', key=(1, 0), position=(0, 1)),
+    Family('diagonal', key=(1, -1), position=(1, 0)),
+    Family('antidiagonal', key=(1, 1), position=(1, 0)),
+)
+
+
+def family_of(line: Line) -> Family:
+    # a single point is horizontal, which keeps it in the first part
+    return next(
+        family for family in FAMILIES
+        if apply(family.key, line.p1.x, line.p1.y) == apply(family.key, line.p2.x, line.p2.y)
+    )
+
 
+def merge(segments: List[Segment]) -> Tuple[Intervals, Intervals]:
+    """ For every key, the disjoint intervals covered by at least one and by at least two of the segments. """
+    changes = collections.Counter()
+    for key, start, end in segments:
+        changes[key, start] += 1
+        changes[key, end + 1] -= 1
+
+    covered, overlapped = collections.defaultdict(list), collections.defaultdict(list)
+    depth, covered_start, overlapped_start = 0, 0, 0
+    # the depth always drops back to 0 after the last change of a key
+    for (key, position), change in sorted(changes.items()):
+        before, depth = depth, depth + change
+        if before < 1 <= depth:
+            covered_start = position
+        elif depth < 1 <= before:
+            covered[key].append((covered_start, position - 1))
+        if before < 2 <= depth:
+            overlapped_start = position
+        elif depth < 2 <= before:
+            overlapped[key].append((overlapped_start, position - 1))
+
+    return covered, overlapped
+
+
+def contains(intervals: Intervals, key: int, position: int) -> bool:
+    row = intervals.get(key, [])
+    i = bisect.bisect_right(row, (position, float('inf'))) - 1
+    return i >= 0 and row[i][1] >= position
+
+
+def sweep(verticals: List[Segment], horizontals: List[Segment]) -> Iterator[Tuple[int, int]]:
+    """
+    Crossings (a, b) of vertical segments (a, b_start, b_end) and horizontal segments (b, a_start, a_end), where
+    horizontal segments with the same b do not overlap.
+    """
+    opening, query, closing = 0, 1, 2
+    events = [(start, opening, b, b) for b, start, end in horizontals]
+    events += [(end, closing, b, b) for b, start, end in horizontals]
+    events += [(a, query, start, end) for a, start, end in verticals]
+    events.sort()
+
+    # b of every horizontal segment that contains the current a, sorted
+    active = []
+    for a, kind, start, end in events:
+        if kind == opening:
+            bisect.insort(active, start)
+        elif kind == closing:
+            del active[bisect.bisect_left(active, start)]
+        else:
+            for b in active[bisect.bisect_left(active, start): bisect.bisect_right(active, end)]:
+                yield a, b
+
+
+def crossings(
+        first: Family, first_lines: Intervals, second: Family, second_lines: Intervals
+) -> Iterator[Tuple[int, int]]:
+    """
+    Points where lines of two families cross. In coordinates a = first.key(p) and b = second.key(p) the first
+    family is vertical and the second one is horizontal.
+    """
+    def transformed(family: Family, lines: Intervals, other: Form) -> List[Segment]:
+        segments = []
+        for key, row in lines.items():
+            for start, end in row:
+                ends = (apply(other, *family.point(key, start)), apply(other, *family.point(key, end)))
+                segments.append((key, min(ends), max(ends)))
+        return segments
+
+    verticals = transformed(first, first_lines, second.key)
+    horizontals = transformed(second, second_lines, first.key)
+    for a, b in sweep(verticals, horizontals):
+        # diagonals only cross antidiagonals where x + y and x - y have the same parity
+        point = solve(first.key, second.key, a, b)
+        if point is not None:
+            yield point
+
+
+def count_overlaps_sparse(lines: List[Line], diagonals: bool) -> int:
+    """
+    Counts points covered by at least two lines without visiting the covered points: overlaps of lines of the same
+    family are merged as intervals and only crossings of lines of different families are visited.
+    """
+    families = FAMILIES if diagonals else FAMILIES[:2]
+    segments = {family: [] for family in families}
     for line in lines:
-        counter.update(line.integer_points())
+        family = family_of(line)
+        if family in segments:
+            segments[family].append(family.segment(line))
+
+    covered, overlapped = {}, {}
+    for family in families:
+        covered[family], overlapped[family] = merge(segments[family])
 
-    return sum(1 for count in counter.values() if count > 1)
+    total = sum(
+        end - start + 1
+        for family in families for row in overlapped[family].values() for start, end in row
+    )
+
+    points = set()
+    for first, second in itertools.combinations(families, 2):
+        points.update(crossings(first, covered[first], second, covered[second]))
+
+    # a crossing is counted once for every family it overlaps in, but has to be counted exactly once
+    for x, y in points:
+        total += 1 - sum(
+            contains(overlapped[family], apply(family.key, x, y), apply(family.position, x, y))
+            for family in families
+        )
+
+    return total
+
+
+def count_overlaps_dense(segments: np.ndarray) -> int:
+    return int((rasterize(segments) > 1).sum())
+
+
+def count_overlaps(lines: List[Line], diagonals: bool) -> int:
+    segments = as_array(lines, diagonals)
+    if len(segments) == 0:
+        return 0
+    width = int(segments[:, [0, 2]].max()) + 1
+    height = int(segments[:, [1, 3]].max()) + 1
+    if segments.min() < 0 or width * height > DENSE_CELLS:
+        return count_overlaps_sparse(lines, diagonals)
+    return count_overlaps_dense(segments)
+
+
+def task1(lines: List[Line]) -> int:
+    return count_overlaps(lines, diagonals=False)
+
+
+def task2(lines: List[Line]) -> int:
+    return count_overlaps(lines, diagonals=True)
 
 
 if __name__ == '__main__':
@@ -1,10 +1,29 @@
-from typing import List
-import numpy as np
+import functools
+from typing import List, Optional, Sequence
 
 
-def read_input() -> List[int]:
-    with open('input.txt', 'r') as reader:
-        return [int(num) for num in reader.readline().split(',')]
+def read_input(path: str = 'input.txt', chunk_size: int = 1 << 20) -> List[int]:
+    """ Number of fish with every timer, counted straight from the comma-separated bytes in chunks. """
+    import numpy as np
+
+    day_0 = np.zeros(9, dtype=np.int64)
+    length = 0
+    with open(path, 'rb') as reader:
+        for chunk in iter(functools.partial(reader.readline, chunk_size), b''):
+            line = chunk.rstrip(b'\r\n')
+            data = np.frombuffer(line, dtype=np.uint8)
+            # timers are single digits, so they take every even position of the line and commas every odd one
+            timers, commas = data[length % 2::2], data[1 - length % 2::2]
+            if (timers < ord('0')).any() or (timers > ord('8')).any() or (commas != ord(',')).any():
+                raise ValueError(f'expected comma-separated timers from 0 to 8 in {path}')
+            day_0 += np.bincount(timers - ord('0'), minlength=9)
+            length += len(line)
+            if len(line) < len(chunk):
+                break
+
+    if length % 2 == 0:
+        raise ValueError(f'expected comma-separated timers from 0 to 8 in {path}')
+    return day_0.tolist()
 
 
 # Let's say that fish(k, t) is the number of fish on day k with timer t, then
@@ -19,7 +38,7 @@ def read_input() -> List[int]:
 # fish(k, 8) = fish(k - 1, 0), as 0-timer fish produce new offsprings;
 #
 # This logic can be encoded in a matrix M, where M[i][j] is 1 if fish(k, i) depends on fish(k - 1, j)
-M = np.matrix([
+M = [
     [0, 1, 0, 0, 0, 0, 0, 0, 0],
     [0, 0, 1, 0, 0, 0, 0, 0, 0],
     [0, 0, 0, 1, 0, 0, 0, 0, 0],
@@ -29,7 +48,7 @@ M = np.matrix([
     [1, 0, 0, 0, 0, 0, 0, 1, 0],
     [0, 0, 0, 0, 0, 0, 0, 0, 1],
     [1, 0, 0, 0, 0, 0, 0, 0, 0]
-], dtype='int64')
+]
 # Let's put all fish(k, i) in a column vector day(k), like this
 # day(k) = [
 #  [fish(k, 0)],
@@ -44,19 +63,62 @@ M = np.matrix([
 # ],
 # then day(k) = M * day(k - 1).
 # Using the same logic, day(k + 1) = M * day(k) = M * (M * day(k - 1)) = M^2 * day(k - 1).
-# In general, day(k) = M^k * day(0). We already know day(0) from the input, and M^k can be computed using
-# exponentiation by squaring, thus resulting in O(log(k)) time complexity.
+# In general, day(k) = M^k * day(0), and the answer is the sum of day(k).
+#
+# By the Cayley-Hamilton theorem M is a root of its characteristic polynomial P(x) = x^9 - x^2 - 1, so M^9 = M^2 + I,
+# and the total number of fish follows total(k) = total(k - 7) + total(k - 9).
+# If x^k = c_0 + c_1 * x + ... + c_8 * x^8 modulo P(x), then M^k = c_0 * I + c_1 * M + ... + c_8 * M^8 as well, so
+# total(k) = c_0 * total(0) + c_1 * total(1) + ... + c_8 * total(8), where the first 9 totals are simulated directly.
+# x^k modulo P(x) is computed by squaring, thus resulting in O(log(k)) multiplications of 9-coefficient polynomials,
+# and the squares x^(2^j) are shared between all horizons.
+
+
+def step(day: List[int]) -> List[int]:
+    return [sum(M[i][j] * day[j] for j in range(9)) for i in range(9)]
+
+
+def multiply(a: List[int], b: List[int], modulus: Optional[int]) -> List[int]:
+    """ a * b modulo P(x), with coefficients modulo `modulus` unless it is None. """
+    product = [0] * 17
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                product[i + j] += x * y
+    # x^i = x^(i - 7) + x^(i - 9) for i >= 9
+    for i in range(16, 8, -1):
+        product[i - 7] += product[i]
+        product[i - 9] += product[i]
+    return [c % modulus for c in product[:9]] if modulus is not None else product[:9]
+
+
+def project(day_0: List[int], horizons: Sequence[int], modulus: Optional[int] = None) -> List[int]:
+    """ Total number of fish after every one of the horizons, exact or modulo `modulus`. """
+    totals, day = [], day_0
+    for _ in range(9):
+        totals.append(sum(day))
+        day = step(day)
+
+    # squares[j] is x^(2^j) modulo P(x)
+    squares = [[0, 1, 0, 0, 0, 0, 0, 0, 0]]
+    results = []
+    for k in horizons:
+        power = [1, 0, 0, 0, 0, 0, 0, 0, 0]
+        for j in range(k.bit_length()):
+            if j == len(squares):
+                squares.append(multiply(squares[-1], squares[-1], modulus))
+            if k >> j & 1:
+                power = multiply(power, squares[j], modulus)
+        total = sum(c * t for c, t in zip(power, totals))
+        results.append(total % modulus if modulus is not None else total)
 
+    return results
 
-def task(fish: List[int], k: int) -> int:
-    day_0 = [0] * 9
-    for fish in fish:
-        day_0[fish] += 1
-    day_0 = np.matrix([[timer] for timer in day_0], dtype='int64')
 
-    return (M ** k * day_0).sum()
+def task(day_0: List[int], k: int) -> int:
+    return project(day_0, [k])[0]
 
 
 if __name__ == '__main__':
-    print(task(read_input(), 80))
-    print(task(read_input(), 256))
+    day_0 = read_input()
+    for total in project(day_0, [80, 256]):
+        print(total)
@@ -1,88 +1,113 @@
-import collections
-from dataclasses import dataclass
-from typing import List
+from typing import Callable, List, Tuple
 
+import numpy as np
 
-def read_input() -> List[int]:
-    with open('input.txt', 'r') as reader:
+
+def read_input(path: str = 'input.txt') -> List[int]:
+    with open(path, 'r') as reader:
         return [int(num) for num in reader.readline().split(',')]
 
 
-@dataclass(order=True)
-class CrabGroup1:
-    position: int
-    count: int
+# cost of moving a single crab, for an array of distances; any convex cost that does not decrease with the distance
+Cost = Callable[[np.ndarray], np.ndarray]
 
-    def add(self, count: int):
-        self.count += count
 
-    def move(self, position: int) -> int:
-        move_cost = abs(self.position - position) * self.count
-        self.position = position
-        return move_cost
+def linear(distances: np.ndarray) -> np.ndarray:
+    return distances
 
 
-def task1(positions: List[int]) -> int:
-    counter = collections.Counter(positions)
-    crabs = [CrabGroup1(position, count) for position, count in counter.items()]
-    crabs.sort()
-    n = len(crabs)
+def triangular(distances: np.ndarray) -> np.ndarray:
+    return distances * (distances + 1) // 2
 
-    right_group = CrabGroup1(crabs[n - 1].position, 0)
-    right_costs = [0] * (n + 1)
 
-    for i in reversed(range(n)):
-        right_costs[i] = right_costs[i + 1] + right_group.move(crabs[i].position)
-        right_group.add(crabs[i].count)
+def quadratic(distances: np.ndarray) -> np.ndarray:
+    return distances * distances
 
-    left_group = CrabGroup1(crabs[0].position, 0)
-    left_costs = [0] * n
 
-    for i in range(1, n):
-        left_group.add(crabs[i - 1].count)
-        left_costs[i] = left_costs[i - 1] + left_group.move(crabs[i].position)
+def capped(limit: int) -> Cost:
+    """ Quadratic up to `limit` and linear with the same slope afterwards, which keeps it convex. """
+    def cost(distances: np.ndarray) -> np.ndarray:
+        return np.where(distances <= limit, distances * distances, limit * (2 * distances - limit))
+    return cost
 
-    return min(left_costs[i] + right_costs[i] for i in range(n))
 
+class Crabs:
+    """
+    Distinct crab positions with their counts, and prefix sums of counts, positions and squared positions over them,
+    so that the total distance to any target is a closed form.
+    """
 
-@dataclass(order=True)
-class CrabGroup2:
-    count: int
-    bias: int = 0
-    cost: int = 1
+    def __init__(self, positions: List[int]):
+        values, counts = np.unique(np.asarray(positions, dtype=np.int64), return_counts=True)
+        self.values = values
+        self.weights = counts
+        # Python ints, as squared positions overflow int64 long before positions do
+        weights, objects = counts.astype(object), values.astype(object)
+        self.counts = np.concatenate(([0], np.cumsum(weights)))
+        self.sums = np.concatenate(([0], np.cumsum(weights * objects)))
+        self.squares = np.concatenate(([0], np.cumsum(weights * objects * objects)))
 
-    def add(self, count: int):
-        self.bias += (self.cost - 1) * self.count
-        self.count += count
-        self.cost = 1
+    @property
+    def total(self) -> int:
+        return self.counts[-1]
 
-    def move(self) -> int:
-        move_cost = self.cost * self.count + self.bias
-        self.cost += 1
-        return move_cost
+    def median(self) -> int:
+        """ The smallest position with at least half of the crabs at or before it. """
+        return int(self.values[np.argmax(self.counts[1:] * 2 >= self.total)])
 
+    def mean(self) -> int:
+        return self.sums[-1] // self.total
 
-def task2(positions: List[int]) -> int:
-    counter = collections.Counter(positions)
-    L, R = min(counter.keys()), max(counter.keys())
+    def distances(self, target: int) -> int:
+        """ Sum of |position - target| over all crabs. """
+        i = int(np.searchsorted(self.values, target, side='right'))
+        left_count, left_sum = self.counts[i], self.sums[i]
+        right_count, right_sum = self.total - left_count, self.sums[-1] - left_sum
+        return target * left_count - left_sum + right_sum - target * right_count
 
-    left_group = CrabGroup2(0)
-    left_costs = collections.Counter()
+    def squared_distances(self, target: int) -> int:
+        """ Sum of (position - target)^2 over all crabs. """
+        return self.squares[-1] - 2 * target * self.sums[-1] + target * target * self.total
 
-    for i in range(L, R + 1):
-        left_costs[i] = left_costs[i - 1] + left_group.move()
-        left_group.add(counter[i])
+    def total_cost(self, cost: Cost, target: int) -> int:
+        distances = np.abs(self.values - target)
+        span = int(self.values[-1] - self.values[0]) + 1
+        if span * span * self.total >= 1 << 62:
+            # squared distances could overflow int64, so the costs are computed with Python ints
+            distances = distances.astype(object)
+        return int((cost(distances) * self.weights).sum())
 
-    right_group = CrabGroup2(0)
-    right_costs = collections.Counter()
+    def align(self, cost: Cost) -> Tuple[int, int]:
+        """ Target with the lowest total cost, and that cost. """
+        low, high = int(self.values[0]), int(self.values[-1])
+        # the total cost is convex and only grows outside of the crabs, so its minimum is the first target
+        # from which moving one step further does not make it any cheaper
+        while low < high:
+            middle = (low + high) // 2
+            if self.total_cost(cost, middle + 1) >= self.total_cost(cost, middle):
+                high = middle
+            else:
+                low = middle + 1
+        return low, self.total_cost(cost, low)
 
-    for i in range(R, L - 1, -1):
-        right_costs[i] = right_costs[i + 1] + right_group.move()
-        right_group.add(counter[i])
 
-    return min(left_costs[i] + right_costs[i] for i in range(L, R + 1))
+def task1(positions: List[int]) -> int:
+    crabs = Crabs(positions)
+    # the weighted median minimizes the sum of distances
+    return crabs.distances(crabs.median())
+
+
+def task2(positions: List[int]) -> int:
+    crabs = Crabs(positions)
+    # moving by d costs 1 + 2 + ... + d = (d^2 + d) / 2, which is minimized within 1/2 of the mean
+    mean = crabs.mean()
+    return min(
+        (crabs.squared_distances(target) + crabs.distances(target)) // 2
+        for target in range(mean - 1, mean + 3)
+    )
 
 
 if __name__ == '__main__':
-    print(task1(read_input()))
-    print(task2(read_input()))
+    positions = read_input()
+    print(task1(positions))
+    print(task2(positions))
@@ -1,6 +1,14 @@
+import argparse
+import functools
 import itertools
+import sys
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from common import inputs  # noqa: E402
 
 
 @dataclass
@@ -14,9 +22,8 @@ def parse_line(line: str) -> Display:
     return Display(left.split(), right.split())
 
 
-def read_input() -> List[Display]:
-    with open('input.txt', 'r') as reader:
-        return [parse_line(line) for line in reader.readlines()]
+def read_input(path: str = 'input.txt') -> List[Display]:
+    return [parse_line(line) for line in inputs.text_lines(path) if line]
 
 
 def task1(displays: List[Display]) -> int:
@@ -43,34 +50,86 @@ DIGITS = {
 }
 
 
-def shuffles():
-    permutations = itertools.permutations(SEGMENTS)
-    return map(lambda permutation: dict(zip(SEGMENTS, permutation)), permutations)
+def frequencies(patterns: List[str]) -> Dict[str, int]:
+    """ How often every segment appears among the ten patterns. """
+    joined = ''.join(patterns)
+    return {segment: joined.count(segment) for segment in SEGMENTS}
 
 
-def convert(code: str, shuffle: Dict[str, str]) -> str:
-    return ''.join(sorted(map(shuffle.get, code)))
+# Rewiring only renames segments, so the sum of the frequencies of its segments does not depend on the wiring,
+# and it happens to be different for every digit.
+def score(pattern: str, frequency: Dict[str, int]) -> int:
+    return sum(map(frequency.__getitem__, pattern))
 
 
-def try_to_decode(display: Display, shuffle: Dict[str, str]) -> Optional[int]:
-    for code in itertools.chain(display.numbers, display.outputs):
-        if convert(code, shuffle) not in DIGITS:
-            return None
-    decoded_outputs = (DIGITS[convert(output, shuffle)] for output in display.outputs)
-    return int(''.join(decoded_outputs))
+DIGITS_BY_SCORE = {score(code, frequencies(list(DIGITS))): digit for code, digit in DIGITS.items()}
 
 
-def task2(displays: List[Display]) -> int:
-    answer = 0
-    for display in displays:
-        for shuffle in shuffles():
-            decoding = try_to_decode(display, shuffle)
-            if decoding is not None:
-                answer += decoding
-                break
-    return answer
+def decode(display: Display) -> int:
+    frequency = frequencies(display.numbers)
+    return int(''.join(DIGITS_BY_SCORE[score(output, frequency)] for output in display.outputs))
+
+
+BITS = {segment: 1 << i for i, segment in enumerate(SEGMENTS)}
+
+
+@functools.lru_cache(maxsize=None)
+def mask(pattern: str) -> int:
+    return sum(map(BITS.__getitem__, pattern))
+
+
+def signature(masks: List[int]) -> int:
+    """ The set of the ten pattern masks as a single int, whatever order the patterns come in. """
+    return sum(1 << pattern for pattern in masks)
+
+
+@functools.lru_cache(maxsize=None)
+def wirings(persist: bool = False) -> Dict[int, Dict[int, str]]:
+    """ For the signature of the ten patterns of every one of the 5040 wirings, the digit of each pattern mask. """
+    if persist:
+        from common.cache import Cache, source_digest
+        from common.days import DAYS
+
+        # keyed by the source, so that editing the digits or the encoding never reads back a stale table
+        key = f'day_08_wirings_{source_digest(DAYS[8])}'
+        table = Cache().get(key)
+        if table is not None:
+            return table
+
+    masks = [(mask(code), digit) for code, digit in DIGITS.items()]
+    table = {}
+    for permutation in itertools.permutations(range(7)):
+        digits = {
+            sum(1 << permutation[segment] for segment in range(7) if pattern >> segment & 1): digit
+            for pattern, digit in masks
+        }
+        table[signature(list(digits))] = digits
+
+    if persist:
+        Cache().put(key, table)
+    return table
+
+
+def look_up(display: Display, table: Dict[int, Dict[int, str]]) -> int:
+    digits = table[signature([mask(number) for number in display.numbers])]
+    return int(''.join(digits[mask(output)] for output in display.outputs))
+
+
+def task2(displays: List[Display], persist: bool = False) -> int:
+    # looking a display up costs about as much as deducing its digits, so the table only pays off once it exists,
+    # either built earlier in this process or kept on disk
+    if not persist and wirings.cache_info().currsize == 0:
+        return sum(decode(display) for display in displays)
+    table = wirings(persist)
+    return sum(look_up(display, table) for display in displays)
 
 
 if __name__ == '__main__':
-    print(task1(read_input()))
-    print(task2(read_input()))
+    parser = argparse.ArgumentParser()
+    parser.add_argument('input', nargs='?', default='input.txt')
+    parser.add_argument('--persist', action='store_true', help='decode through the wiring table kept in the cache')
+    args = parser.parse_args()
+
+    displays = read_input(args.input)
+    print(task1(displays))
+    print(task2(displays, args.persist))
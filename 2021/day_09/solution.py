@@ -1,93 +1,169 @@
-import collections
+import argparse
 import functools
 import heapq
+import itertools
 import operator
+import sys
 from dataclasses import dataclass
-from typing import List, Tuple, Iterator, Set
-
-DELTAS = [(-1, 0), (0, -1), (0, 1), (1, 0)]
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from common import inputs  # noqa: E402
+from common.grid import ORTHOGONAL, Grid  # noqa: E402
+
+
+def largest(sizes: Iterable[int], k: int = 3) -> List[int]:
+    """ The k largest sizes, in no particular order. """
+    heap = []
+    for size in sizes:
+        if len(heap) < k:
+            heapq.heappush(heap, size)
+        elif heap[0] < size:
+            heapq.heapreplace(heap, size)
+    return heap
+
+
+def components(count: int, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """ For each of `count` nodes, the smallest node connected to it through the edges (first[i], second[i]). """
+    parent = np.arange(count)
+    while True:
+        # every node points straight at the root of its tree here
+        a, b = parent[first], parent[second]
+        different = a != b
+        if not different.any():
+            return parent
+        a, b = a[different], b[different]
+        # hook the larger root of every edge under the smaller one, which can never create a cycle
+        np.minimum.at(parent, np.maximum(a, b), np.minimum(a, b))
+        while True:
+            grandparent = parent[parent]
+            if (grandparent == parent).all():
+                break
+            parent = grandparent
 
 
 @dataclass
 class Matrix:
-    heights: List[List[int]]
+    heights: Grid
 
     @property
     def n(self) -> int:
-        return len(self.heights)
+        return self.heights.n
 
     @property
     def m(self) -> int:
-        return len(self.heights[0])
+        return self.heights.m
 
-    def get(self, x: int, y: int) -> int:
-        return self.heights[x][y]
+    def low_points(self) -> np.ndarray:
+        # cells outside of the map are higher than any height, so they never prevent a low point
+        neighbours = self.heights.neighbour_views(ORTHOGONAL, fill=10)
+        return functools.reduce(np.logical_and, (self.heights.cells < neighbour for neighbour in neighbours))
 
-    def coordinates(self) -> Iterator[Tuple[int, int, int]]:
-        for x in range(self.n):
-            for y in range(self.m):
-                yield x, y, self.get(x, y)
+    def task1(self) -> int:
+        return int((self.heights.cells[self.low_points()].astype(np.int64) + 1).sum())
 
-    def neighbours(self, x: int, y: int) -> Iterator[Tuple[int, int, int]]:
-        for dx, dy in DELTAS:
-            i, j = x + dx, y + dy
-            if 0 <= i < self.n and 0 <= j < self.m:
-                yield i, j, self.get(i, j)
+    def basin_sizes(self) -> np.ndarray:
+        """ Sizes of all basins, in some order. """
+        basin = self.heights.cells != 9
 
-    def is_low_point(self, x: int, y: int) -> bool:
-        height = self.get(x, y)
-        for i, j, h in self.neighbours(x, y):
-            if height >= h:
-                return False
-        return True
+        # basin cells are labeled by the horizontal run they belong to, counting runs in reading order
+        starts = basin.copy()
+        starts[:, 1:] &= ~basin[:, :-1]
+        labels = np.cumsum(starts, dtype=np.int32).reshape(basin.shape) - 1
 
-    def task1(self) -> int:
-        answer = 0
-        for x, y, h in self.coordinates():
-            if self.is_low_point(x, y):
-                answer += h + 1
-        return answer
+        # runs that share a column in consecutive rows belong to the same basin, and one shared column is enough
+        vertical = basin[:-1] & basin[1:]
+        vertical[:, 1:] &= ~(basin[:-1, :-1] & basin[1:, :-1])
+        roots = components(int(starts.sum()), labels[:-1][vertical], labels[1:][vertical])
 
-    def get_basin(self, x: int, y: int) -> Set[Tuple[int, int]]:
-        basin = {(x, y)}
-        queue = collections.deque([(x, y)])
+        sizes = np.bincount(roots[labels[basin]])
+        return sizes[sizes > 0]
 
-        while queue:
-            x, y = queue.popleft()
-            for i, j, h in self.neighbours(x, y):
-                if h != 9 and (i, j) not in basin:
-                    basin.add((i, j))
-                    queue.append((i, j))
+    def task2(self) -> int:
+        return functools.reduce(operator.mul, largest(self.basin_sizes().tolist()))
 
-        return basin
 
-    def task2(self) -> int:
-        used = set()
-        basin_sizes = []
+def runs(basin: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """ Starts and exclusive ends of the runs of basin cells in a row. """
+    steps = np.diff(basin.astype(np.int8), prepend=0, append=0)
+    return np.flatnonzero(steps == 1), np.flatnonzero(steps == -1)
+
+
+def streamed_risk_levels(rows: Iterable[bytes]) -> Iterator[int]:
+    """ Risk levels of all low points of a heightmap read one row of digits at a time, keeping three rows at most. """
+    above = current = None
+    for row in itertools.chain(filter(None, rows), [None]):
+        below = None if row is None else np.frombuffer(row, dtype=np.uint8).astype(np.int16) - ord('0')
+        if current is not None:
+            # cells outside of the map are higher than any height, so they never prevent a low point
+            padded = np.pad(current, 1, constant_values=10)
+            low = (current < padded[:-2]) & (current < padded[2:])
+            if above is not None:
+                low &= current < above
+            if below is not None:
+                low &= current < below
+            yield from (current[low] + 1).tolist()
+        above, current = current, below
+
+
+def streamed_basin_sizes(rows: Iterable[bytes]) -> Iterator[int]:
+    """
+    Sizes of all basins of a heightmap read one row of digits at a time, in the order the basins end. Only the
+    basins that reach the latest row are kept, so memory depends on the width of the map and not on its height.
+    """
+    # runs of the latest row, the basin of each of them, and the size so far of every basin that reaches the row
+    starts = ends = labels = sizes = np.zeros(0, dtype=np.int64)
+
+    for row in rows:
+        if not row:
+            continue
+        new_starts, new_ends = runs(np.frombuffer(row, dtype=np.uint8) != ord('9'))
+        count = len(sizes)
+
+        # the runs of the latest row that overlap a new run form a contiguous range
+        low = np.searchsorted(ends, new_starts, side='right')
+        overlaps = np.searchsorted(starts, new_ends, side='left') - low
+        new = np.repeat(np.arange(len(new_starts)), overlaps)
+        old = np.arange(len(new)) - np.repeat(np.cumsum(overlaps) - overlaps - low, overlaps)
+
+        # nodes are the basins that reach the latest row, followed by the new runs
+        roots = components(count + len(new_starts), labels[old], count + new)
+        totals = np.zeros(count + len(new_starts), dtype=np.int64)
+        np.add.at(totals, roots, np.concatenate([sizes, new_ends - new_starts]))
+
+        alive = np.unique(roots[count:])
+        yield from totals[np.setdiff1d(roots[:count], alive)].tolist()
+        starts, ends, labels, sizes = new_starts, new_ends, np.searchsorted(alive, roots[count:]), totals[alive]
 
-        for x, y, h in self.coordinates():
-            if h != 9 and (x, y) not in used:
-                basin = self.get_basin(x, y)
-                used.update(basin)
+    yield from sizes.tolist()
 
-                if len(basin_sizes) < 3:
-                    heapq.heappush(basin_sizes, len(basin))
-                elif basin_sizes[0] < len(basin):
-                    heapq.heapreplace(basin_sizes, len(basin))
 
-        return functools.reduce(operator.mul, basin_sizes)
+def streamed_task1(path: str = 'input.txt') -> int:
+    return sum(streamed_risk_levels(inputs.lines(path)))
 
 
-def parse_line(line: str) -> List[int]:
-    return [int(c) for c in line.strip()]
+def streamed_task2(path: str = 'input.txt') -> int:
+    return functools.reduce(operator.mul, largest(streamed_basin_sizes(inputs.lines(path))))
 
 
-def read_input() -> List[List[int]]:
-    with open('input.txt', 'r') as reader:
-        return [parse_line(line) for line in reader.readlines()]
+def read_input(path: str = 'input.txt') -> Grid:
+    return Grid(inputs.digit_grid(path))
 
 
 if __name__ == '__main__':
-    matrix = Matrix(read_input())
-    print(matrix.task1())
-    print(matrix.task2())
+    parser = argparse.ArgumentParser()
+    parser.add_argument('input', nargs='?', default='input.txt')
+    parser.add_argument('--stream', action='store_true', help='read the heightmap one row at a time')
+    args = parser.parse_args()
+
+    if args.stream:
+        print(streamed_task1(args.input))
+        print(streamed_task2(args.input))
+    else:
+        matrix = Matrix(read_input(args.input))
+        print(matrix.task1())
+        print(matrix.task2())
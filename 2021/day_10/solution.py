@@ -1,11 +1,22 @@
+import argparse
 import functools
-import statistics
-from typing import List
+import os
+import random
+import sys
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-def read_input() -> List[str]:
-    with open('input.txt', 'r') as reader:
-        return [line.strip() for line in reader.readlines()]
+from common import inputs  # noqa: E402
+
+
+def stream(path: str = 'input.txt') -> Iterator[str]:
+    return (line.strip() for line in inputs.text_lines(path))
+
+
+def read_input(path: str = 'input.txt') -> List[str]:
+    return list(stream(path))
 
 
 CHARS = {
@@ -28,43 +39,108 @@ COMPLETION_SCORES = {
 }
 
 
-def syntax_error_score(chunk: str) -> int:
+CORRUPTED, INCOMPLETE, COMPLETE = 'corrupted', 'incomplete', 'complete'
+
+
+def classify(chunk: str) -> Tuple[str, int, int]:
+    """ Status of the chunk with its syntax error score and its completion score, from a single scan. """
+    # closing characters expected by the chunks that are still open
     stack = []
 
     for c in chunk:
         if c in CHARS:
-            stack.append(c)
-        else:
-            if not stack or CHARS[stack[-1]] != c:
-                return SYNTAX_ERROR_SCORES[c]
-            stack.pop()
+            stack.append(CHARS[c])
+        elif not stack or stack.pop() != c:
+            return CORRUPTED, SYNTAX_ERROR_SCORES[c], 0
 
-    return 0
+    if not stack:
+        return COMPLETE, 0, 0
+    return INCOMPLETE, 0, functools.reduce(lambda score, char: score * 5 + COMPLETION_SCORES[char], reversed(stack), 0)
 
 
-def task1(chunks: List[str]) -> int:
-    return sum(map(syntax_error_score, chunks))
+def score(chunks: Iterable[str]) -> Tuple[int, List[int]]:
+    """ Total syntax error score and the completion scores of all incomplete chunks. """
+    syntax_error_score, completion_scores = 0, []
 
+    for chunk in chunks:
+        status, error, completion = classify(chunk)
+        if status == CORRUPTED:
+            syntax_error_score += error
+        elif status == INCOMPLETE:
+            completion_scores.append(completion)
 
-def completion_score(chunk: str) -> int:
-    stack = []
+    return syntax_error_score, completion_scores
 
-    for c in chunk:
-        if c in CHARS:
-            stack.append(c)
-        else:
-            if not stack or CHARS[stack[-1]] != c:
-                return 0
-            stack.pop()
 
-    return functools.reduce(lambda score, char: score * 5 + COMPLETION_SCORES[CHARS[char]], reversed(stack), 0)
+def select(values: List[int], k: int) -> int:
+    """ The k-th smallest value, counting from 0, in expected linear time. """
+    while True:
+        pivot = random.choice(values)
+        smaller = [value for value in values if value < pivot]
+        if k < len(smaller):
+            values = smaller
+            continue
+
+        k -= len(smaller) + values.count(pivot)
+        if k < 0:
+            return pivot
+        values = [value for value in values if value > pivot]
+
 
+def median(values: List[int]) -> Optional[Union[int, float]]:
+    """ The median, or None when there are no values. """
+    if not values:
+        return None
+    middle = len(values) // 2
+    if len(values) % 2 == 1:
+        return select(values, middle)
+    return (select(values, middle - 1) + select(values, middle)) / 2
 
-def task2(chunks: List[str]) -> int:
-    return statistics.median(filter(lambda score: score > 0, map(completion_score, chunks)))
+
+def score_range(path: str, start: int, end: int) -> Tuple[int, List[int]]:
+    return score(line.decode().strip() for line in inputs.lines(path, start, end))
+
+
+def score_in_parallel(path: str = 'input.txt', workers: Optional[int] = None) -> Tuple[int, List[int]]:
+    """ Same as `score` over the whole file, with every worker process scoring its own range of lines. """
+    import concurrent.futures
+
+    workers = workers or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(score_range, path, start, end) for start, end in inputs.line_ranges(path, workers)]
+        syntax_error_score, completion_scores = 0, []
+        for future in futures:
+            errors, completions = future.result()
+            syntax_error_score += errors
+            completion_scores.extend(completions)
+    return syntax_error_score, completion_scores
+
+
+def solve(path: str = 'input.txt', workers: Optional[int] = None) -> Tuple[int, Optional[Union[int, float]]]:
+    """
+    Answers to both tasks from a single pass over the file, which is split between `workers` processes unless it
+    is None; 0 means a process per CPU.
+    """
+    if workers is None:
+        syntax_error_score, completion_scores = score(stream(path))
+    else:
+        syntax_error_score, completion_scores = score_in_parallel(path, workers)
+    return syntax_error_score, median(completion_scores)
+
+
+def task1(chunks: Iterable[str]) -> int:
+    return score(chunks)[0]
+
+
+def task2(chunks: Iterable[str]) -> Optional[Union[int, float]]:
+    return median(score(chunks)[1])
 
 
 if __name__ == '__main__':
-    chunks = read_input()
-    print(task1(chunks))
-    print(task2(chunks))
+    parser = argparse.ArgumentParser()
+    parser.add_argument('input', nargs='?', default='input.txt')
+    parser.add_argument('--workers', type=int, help='score the input in this many processes, 0 for one per CPU')
+    args = parser.parse_args()
+
+    for answer in solve(args.input, args.workers):
+        print(answer)
@@ -1,101 +1,110 @@
-import collections
-from typing import List, Tuple
+import hashlib
+import sys
+from pathlib import Path
+from typing import List, Optional
 
+import numpy as np
 
-def read_line(line: str) -> List[int]:
-    return list(map(int, line.strip()))
+sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+from common import inputs  # noqa: E402
+from common.grid import ADJACENT, Grid  # noqa: E402
 
-def read_input() -> List[List[int]]:
-    with open('input.txt', 'r') as reader:
-        return list(map(read_line, reader.readlines()))
 
+def read_input(path: str = 'input.txt') -> Grid:
+    return Grid(inputs.digit_grid(path))
 
-class Matrix:
-    DELTAS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
-
-    def __init__(self, energy: List[List[int]]):
-        self.energy = energy
-        self.n = len(energy)
-        self.m = len(energy[0])
-
-    def neighbours(self, x: int, y: int):
-        for dx, dy in self.DELTAS:
-            i, j = x + dx, y + dy
-            if 0 <= i < self.n and 0 <= j < self.m:
-                yield i, j
-
-    def coordinates(self):
-        for x in range(self.n):
-            for y in range(self.m):
-                yield x, y
-
-    def normalise(self) -> int:
-        flashes = 0
-
-        for x, y in self.coordinates():
-            if self.energy[x][y] == 10:
-                flashes += 1
-                self.energy[x][y] = 0
-
-        return flashes
 
-    def increment(self) -> List[Tuple[int, int]]:
-        flashes = []
-
-        for x, y in self.coordinates():
-            self.energy[x][y] += 1
-            if self.energy[x][y] == 10:
-                flashes.append((x, y))
+class Matrix:
+    def __init__(self, energy: Grid):
+        # copied, so that simulating does not change the given grid
+        self.energy = energy.copy()
+        self.n = energy.n
+        self.m = energy.m
 
-        return flashes
+    def next_step(self) -> int:
+        cells = self.energy.cells
+        cells += 1
+        flashed = np.zeros(cells.shape, dtype=bool)
+        firing = cells > 9
+
+        # every round, the octopuses that have just flashed raise the energy of all their neighbours at once;
+        # a cell gains at most 8 this way, so the energy stays far below the uint8 limit
+        while firing.any():
+            flashed |= firing
+            for neighbour in Grid(firing).neighbour_views(ADJACENT, fill=0):
+                cells += neighbour
+            firing = (cells > 9) & ~flashed
+
+        cells[flashed] = 0
+        return int(np.count_nonzero(flashed))
 
-    def flash(self, x: int, y: int) -> List[Tuple[int, int]]:
-        flashes = []
+    def is_synced(self) -> bool:
+        return bool((self.energy.cells == self.energy[0, 0]).all())
 
-        for i, j in self.neighbours(x, y):
-            if self.energy[i][j] == 10:
-                continue
-            self.energy[i][j] += 1
-            if self.energy[i][j] == 10:
-                flashes.append((i, j))
 
-        return flashes
+class Forecast:
+    """
+    Records the simulation step by step until its state repeats. The states are periodic from then on, so the
+    flashes of any later step follow from the recorded ones.
+    """
 
-    def next_step(self) -> int:
-        queue = collections.deque(self.increment())
+    def __init__(self, energy: Grid):
+        self.matrix = Matrix(energy)
+        # flashes[t] is the total number of flashes after t steps
+        self.flashes: List[int] = [0]
+        self.sync_step: Optional[int] = 0 if self.matrix.is_synced() else None
+        self.seen = {self.state(): 0}
+        self.cycle_start: Optional[int] = None
+        self.cycle_length: Optional[int] = None
 
-        while queue:
-            x, y = queue.popleft()
-            queue.extend(self.flash(x, y))
+    def state(self) -> bytes:
+        return hashlib.blake2b(self.matrix.energy.cells.tobytes(), digest_size=16).digest()
 
-        return self.normalise()
+    def advance(self) -> bool:
+        """ Simulates one more step, unless the cycle is already known. """
+        if self.cycle_length is not None:
+            return False
 
-    def is_synced(self) -> bool:
-        return all(e == self.energy[0][0] for row in self.energy for e in row)
+        step = len(self.flashes)
+        self.flashes.append(self.flashes[-1] + self.matrix.next_step())
+        if self.sync_step is None and self.matrix.is_synced():
+            self.sync_step = step
 
+        state = self.state()
+        if state in self.seen:
+            self.cycle_start = self.seen[state]
+            self.cycle_length = step - self.cycle_start
+        else:
+            self.seen[state] = step
+        return True
 
-def task1(energy: List[List[int]], steps: int) -> int:
-    matrix = Matrix(energy)
-    answer = 0
+    def total_flashes(self, steps: int) -> int:
+        while len(self.flashes) <= steps and self.advance():
+            pass
+        if steps < len(self.flashes):
+            return self.flashes[steps]
 
-    for _ in range(steps):
-        answer += matrix.next_step()
+        cycles, rest = divmod(steps - self.cycle_start, self.cycle_length)
+        per_cycle = self.flashes[self.cycle_start + self.cycle_length] - self.flashes[self.cycle_start]
+        return self.flashes[self.cycle_start + rest] + cycles * per_cycle
 
-    return answer
+    def first_sync(self) -> Optional[int]:
+        """ The first step after which all octopuses have the same energy, or None if that never happens. """
+        while self.sync_step is None and self.advance():
+            pass
+        return self.sync_step
 
 
-def task2(energy: List[List[int]]) -> int:
-    matrix = Matrix(energy)
-    answer = 0
+def task1(energy: Grid, steps: int) -> int:
+    return Forecast(energy).total_flashes(steps)
 
-    while not matrix.is_synced():
-        answer += 1
-        matrix.next_step()
 
-    return answer
+def task2(energy: Grid) -> Optional[int]:
+    return Forecast(energy).first_sync()
 
 
 if __name__ == '__main__':
-    print(task1(read_input(), 100))
-    print(task2(read_input()))
+    forecast = Forecast(read_input())
+    print(forecast.total_flashes(100))
+    print(forecast.first_sync())
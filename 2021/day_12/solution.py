@@ -1,6 +1,12 @@
 import collections
-from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Tuple
+import functools
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from common import inputs  # noqa: E402
 
 
 def read_line(line: str) -> Tuple[str, str]:
@@ -8,153 +14,137 @@ def read_line(line: str) -> Tuple[str, str]:
     return start, end
 
 
-def read_input() -> List[Tuple[str, str]]:
-    with open('input.txt', 'r') as reader:
-        return [read_line(line) for line in reader.readlines()]
-
-
-@dataclass(eq=True, frozen=True)
-class Cave:
-    name: str
-    id: int
-
-    @classmethod
-    def is_small_cave_name(cls, cave_name: str) -> bool:
-        return cave_name not in ('start', 'end') and cave_name.islower()
-
-    @classmethod
-    def from_cave_names(cls, cave_names: Iterable[str]) -> Dict[str, 'Cave']:
-        small_cave_names = filter(lambda cave_name: cls.is_small_cave_name(cave_name), cave_names)
-        other_cave_names = filter(lambda cave_name: not cls.is_small_cave_name(cave_name), cave_names)
-        small_caves = {
-            cave_name: Cave(cave_name, cave_id)
-            for cave_id, cave_name in enumerate(small_cave_names)
-        }
-        other_caves = {
-            cave_name: Cave(cave_name, cave_id)
-            for cave_id, cave_name in enumerate(other_cave_names, len(small_caves))
-        }
-        return dict(**small_caves, **other_caves)
-
-    def is_start(self):
-        return self.name == 'start'
-
-    def is_small(self):
-        return self.is_small_cave_name(self.name)
-
-
-class State:
-    allow_two_visits_for_single_small_cave: bool
-    visits: List[Cave]
-    visit_count: Dict[Cave, int]
-    twice_visited_small_cave: Optional[Cave]
-    hash: Tuple[int, ...]
-
-    def __init__(self, start_cave: Cave, allow_two_visits: bool):
-        self.allow_two_visits_for_single_small_cave = allow_two_visits
-        self.visits = [start_cave]
-        self.visit_count = collections.Counter({start_cave: 1})
-        self.twice_visited_small_cave = None
-        self.hash = (0, start_cave.id)
-
-    @property
-    def last(self):
-        return self.visits[-1]
-
-    def update_hash(self, extra_hash: int = 0):
-        if self.twice_visited_small_cave is None:
-            self.hash = (self.hash[0] + extra_hash, self.visits[-1].id)
-        else:
-            self.hash = (self.hash[0] + extra_hash, self.visits[-1].id, self.twice_visited_small_cave.id)
-
-    def is_valid_move(self, cave: Cave) -> bool:
-        if self.last == cave or cave.is_start():
-            return False
-        if cave.is_small():
-            if self.visit_count[cave] == 0:
-                return True
-            if not self.allow_two_visits_for_single_small_cave:
-                return False
-            if self.visit_count[cave] == 1 and self.twice_visited_small_cave is None:
-                return True
-            return False
-        return True
-
-    def move(self, cave: Cave):
-        self.visits.append(cave)
-        self.visit_count[cave] += 1
-        if cave.is_small():
-            if self.visit_count[cave] == 2:
-                self.twice_visited_small_cave = cave
-                self.update_hash()
-            else:
-                self.update_hash(1 << cave.id)
-        else:
-            self.update_hash()
-
-    def cancel_move(self):
-        cave = self.visits.pop()
-        self.visit_count[cave] -= 1
-        if cave.is_small():
-            if self.visit_count[cave] == 1:
-                self.twice_visited_small_cave = None
-                self.update_hash()
-            else:
-                self.update_hash(-(1 << cave.id))
-        else:
-            self.update_hash()
-
-
-class Graph:
-    def __init__(self, edges: List[Tuple[str, str]]):
-        cave_names = {cave_name for edge in edges for cave_name in edge}
-        caves_by_name = Cave.from_cave_names(cave_names)
-
-        self.graph = collections.defaultdict(list)
-        self.start_cave = caves_by_name['start']
-        self.end_cave = caves_by_name['end']
+def read_input(path: str = 'input.txt') -> List[Tuple[str, str]]:
+    return [read_line(line) for line in inputs.text_lines(path) if line]
 
-        for edge_from, edge_to in edges:
-            edge_from_cave = caves_by_name[edge_from]
-            edge_to_cave = caves_by_name[edge_to]
 
-            # forbid adding (cave -> start) and (end -> cave) edges
-            if edge_from != 'end' and edge_to != 'start':
-                self.graph[edge_from_cave].append(edge_to_cave)
+START, END = 'start', 'end'
 
-            # forbid adding (cave -> start) and (end -> cave) edges
-            if edge_to != 'end' and edge_from != 'start':
-                self.graph[edge_to_cave].append(edge_from_cave)
 
-        self.mem = {}
+def is_small(cave_name: str) -> bool:
+    return cave_name not in (START, END) and cave_name.islower()
 
-    def dfs(self, state: State) -> int:
-        if state.hash in self.mem:
-            return self.mem[state.hash]
 
-        if state.last == self.end_cave:
-            return 1
-
-        paths = 0
-
-        for cave in self.graph[state.last]:
-            if not state.is_valid_move(cave):
-                continue
-            state.move(cave)
-            paths += self.dfs(state)
-            state.cancel_move()
-
-        self.mem[state.hash] = paths
-
-        return paths
+class Graph:
+    """
+    Small caves get the ids 0..k-1, so that the set of visited ones fits in a bitmask, followed by start and end.
+    Big caves get no id: every walk through one of them becomes a weighted edge between its neighbours.
+    """
 
-    def count_paths(self, allow_two_visits_for_single_small_cave: bool) -> int:
-        self.mem.clear()
-        paths = self.dfs(State(self.start_cave, allow_two_visits_for_single_small_cave))
-        self.mem.clear()
-        return paths
+    def __init__(self, edges: List[Tuple[str, str]]):
+        # lists rather than sets, so that repeated edges keep counting as separate ways
+        neighbours = collections.defaultdict(list)
+        for left, right in edges:
+            neighbours[left].append(right)
+            neighbours[right].append(left)
+
+        small_cave_names = sorted(filter(is_small, neighbours))
+        self.ids = {cave_name: i for i, cave_name in enumerate(small_cave_names + [START, END])}
+        self.small_caves = len(small_cave_names)
+        self.start, self.end = self.ids[START], self.ids[END]
+
+        # weights[u][v] is the number of ways to get from u to v, directly or through a single big cave,
+        # including the ways back to u itself
+        weights = [collections.Counter() for _ in self.ids]
+        for cave_name, cave in self.ids.items():
+            for neighbour in neighbours[cave_name]:
+                if neighbour in self.ids:
+                    weights[cave][self.ids[neighbour]] += 1
+                else:
+                    for other in neighbours[neighbour]:
+                        weights[cave][self.ids[other]] += 1
+
+        # forbid (cave -> start) and (end -> cave) edges
+        self.graph: List[List[Tuple[int, int]]] = [
+            [(other, weight) for other, weight in sorted(weights[cave].items()) if other != self.start]
+            if cave != self.end else []
+            for cave in range(len(self.ids))
+        ]
+
+        # small neighbours of every cave as a bitmask, for finding the caves a walk can still reach
+        self.adjacent = [
+            sum(1 << other for other, _ in self.graph[cave] if other < self.small_caves)
+            for cave in range(len(self.ids))
+        ]
+        self.all_small_caves = (1 << self.small_caves) - 1
+        self.next_to_end = sum(
+            1 << cave for cave in range(self.small_caves) if any(other == self.end for other, _ in self.graph[cave])
+        )
+
+    def spread(self, frontier: int, free: int) -> int:
+        """ Caves among `free` that can be reached from the `frontier` caves through `free` caves only. """
+        reached = 0
+        frontier &= free
+        while frontier:
+            reached |= frontier
+            neighbours = 0
+            while frontier:
+                lowest = frontier & -frontier
+                neighbours |= self.adjacent[lowest.bit_length() - 1]
+                frontier ^= lowest
+            frontier = neighbours & free & ~reached
+        return reached
+
+    def reachable(self, cave: int, visited: int, twice: bool) -> int:
+        """
+        Unvisited small caves that a walk from the cave can still enter. Only they can change the number of ways to
+        the end: every other small cave is either out of reach or visited, and visited caves adjacent to the reachable
+        ones stay just as available for the single second visit whatever the rest of the visited set is.
+        """
+        free = self.all_small_caves & ~visited
+        reached = self.spread(self.adjacent[cave], free)
+        if not twice:
+            # a second visit to a small cave next to the reachable ones continues from there
+            around = self.adjacent[cave]
+            rest = reached
+            while rest:
+                lowest = rest & -rest
+                around |= self.adjacent[lowest.bit_length() - 1]
+                rest ^= lowest
+            second_visits = around & visited
+            while second_visits:
+                lowest = second_visits & -second_visits
+                reached |= self.spread(self.adjacent[lowest.bit_length() - 1], free)
+                second_visits ^= lowest
+        return reached
+
+    def count_paths(self, allow_two_visits_for_single_small_cave: bool, cache_size: int = 1 << 21) -> int:
+        cave_bits = len(self.ids).bit_length()
+
+        def state(cave: int, reachable: int, twice: bool) -> int:
+            # a single int makes a much smaller cache key than a tuple
+            return (reachable << cave_bits | cave) << 1 | twice
+
+        # keyed by the reachable caves rather than the visited ones, so that walks which differ only in caves they
+        # cannot return to share their counts; the bound trades recounting for memory on huge cave systems
+        @functools.lru_cache(maxsize=cache_size)
+        def count(key: int) -> int:
+            """ Paths from the cave to the end that only enter the reachable small caves for the first time. """
+            twice = key & 1
+            cave = key >> 1 & (1 << cave_bits) - 1
+            reachable = key >> cave_bits + 1
+            if twice and cave < self.small_caves and not (reachable | 1 << cave) & self.next_to_end:
+                # nothing left to enter leads to the end
+                return 0
+
+            # whatever else was visited makes no difference, so everything else counts as visited
+            visited = self.all_small_caves & ~reachable
+            paths = 0
+            for other, weight in self.graph[cave]:
+                if other == self.end:
+                    paths += weight
+                elif not visited >> other & 1:
+                    bit = 1 << other
+                    paths += weight * count(state(other, self.reachable(other, visited | bit, twice), twice))
+                elif not twice:
+                    paths += weight * count(state(other, self.reachable(other, visited, True), True))
+            return paths
+
+        twice = not allow_two_visits_for_single_small_cave
+        return count(state(self.start, self.reachable(self.start, 0, twice), twice))
 
 
 if __name__ == '__main__':
-    print(Graph(read_input()).count_paths(allow_two_visits_for_single_small_cave=False))
-    print(Graph(read_input()).count_paths(allow_two_visits_for_single_small_cave=True))
+    graph = Graph(read_input())
+    print(graph.count_paths(allow_two_visits_for_single_small_cave=False))
+    print(graph.count_paths(allow_two_visits_for_single_small_cave=True))
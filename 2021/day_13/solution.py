@@ -1,12 +1,7 @@
+import sys
 from dataclasses import dataclass
 from typing import List, Set, Tuple
 
-from PIL import Image
-import pytesseract
-
-
-pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-
 
 @dataclass(eq=True, frozen=True)
 class Point:
@@ -47,6 +42,13 @@ class Matrix:
             self.fold_y(fold.value)
 
     def as_text(self) -> str:
+        # imported here, as only reading the code needs image and OCR libraries
+        from PIL import Image
+        import pytesseract
+
+        if sys.platform == 'win32':
+            pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+
         min_x = min(point.x for point in self.points)
         min_y = min(point.y for point in self.points)
         max_x = max(point.x for point in self.points)
@@ -65,8 +67,8 @@ class Matrix:
         return pytesseract.image_to_string(image, config='--psm 8')
 
 
-def read_input() -> Tuple[Set[Point], List[Fold]]:
-    with open('input.txt', 'r') as reader:
+def read_input(path: str = 'input.txt') -> Tuple[Set[Point], List[Fold]]:
+    with open(path, 'r') as reader:
         it = iter(reader)
         points = set()
         folds = []
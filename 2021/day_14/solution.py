@@ -1,8 +1,9 @@
 import collections
 import dataclasses
-from typing import List, Tuple, Iterable, Set, Dict
+from typing import List, Tuple, Iterable, Set, Dict, TYPE_CHECKING
 
-import numpy as np
+if TYPE_CHECKING:
+    import numpy as np
 
 
 @dataclasses.dataclass
@@ -40,8 +41,8 @@ def parse_insertion(line: str) -> Insertion:
     return Insertion(between[0], inserted, between[1])
 
 
-def read_input() -> Tuple[Formula, List[Insertion]]:
-    with open('input.txt', 'r') as reader:
+def read_input(path: str = 'input.txt') -> Tuple[Formula, List[Insertion]]:
+    with open(path, 'r') as reader:
         it = iter(reader)
         formula = Formula(next(it).strip())
         insertions = [parse_insertion(line) for line in map(str.strip, it) if line]
@@ -56,7 +57,9 @@ def all_pairs(formula: Formula, insertions: List[Insertion]) -> Set[Tuple[str, s
     return pairs
 
 
-def get_transition_matrix(insertions: List[Insertion], pair_to_index: Dict[Tuple[str, str], int]) -> np.matrix:
+def get_transition_matrix(insertions: List[Insertion], pair_to_index: Dict[Tuple[str, str], int]) -> 'np.matrix':
+    import numpy as np
+
     n = len(pair_to_index)
     transitions = [[0] * n for _ in range(n)]
 
@@ -77,7 +80,9 @@ def get_transition_matrix(insertions: List[Insertion], pair_to_index: Dict[Tuple
     return np.matrix(transitions, dtype='int64')
 
 
-def get_initial_state_matrix(formula: Formula, pair_to_index: Dict[Tuple[str, str], int]) -> np.matrix:
+def get_initial_state_matrix(formula: Formula, pair_to_index: Dict[Tuple[str, str], int]) -> 'np.matrix':
+    import numpy as np
+
     n = len(pair_to_index)
     initial_column_vector = [[0] for _ in range(n)]
 
@@ -1,47 +1,30 @@
 import heapq
-from typing import List, Tuple, Iterator
+import sys
+from pathlib import Path
 
+import numpy as np
 
-def parse_line(line: str) -> List[int]:
-    return [int(c) for c in line.strip()]
+sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+from common import inputs  # noqa: E402
+from common.grid import Grid  # noqa: E402
 
-def read_input() -> List[List[int]]:
-    with open('input.txt', 'r') as reader:
-        return [parse_line(line) for line in reader.readlines()]
 
+def read_input(path: str = 'input.txt') -> Grid:
+    return Grid(inputs.digit_grid(path))
 
-class Grid:
-    DELTAS = [(-1, 0), (0, -1), (0, 1), (1, 0)]
 
-    grid: List[List[int]]
-    n: int
-    m: int
-    height: int
-    width: int
+def tile(grid: Grid, repeats: int) -> Grid:
+    # tile (i, j) is the original grid with every risk increased by i + j, wrapping from 9 back to 1
+    increments = np.add.outer(np.arange(repeats), np.arange(repeats))
+    tiles = (grid.cells[None, None, :, :] + increments[:, :, None, None] - 1) % 9 + 1
+    return Grid(tiles.transpose(0, 2, 1, 3).reshape(repeats * grid.n, repeats * grid.m))
 
-    def __init__(self, grid: List[List[int]], repeats: int):
-        self.grid = grid
-        self.n = len(grid)
-        self.m = len(grid[0])
-        self.height = self.n * repeats
-        self.width = self.m * repeats
 
-    def get(self, x: int, y: int):
-        value = self.grid[x % self.n][y % self.m]
-        dx, dy = x // self.n, y // self.m
-        return (value + dx + dy - 1) % 9 + 1
-
-    def neighbours(self, x: int, y: int) -> Iterator[Tuple[int, int]]:
-        for dx, dy in self.DELTAS:
-            i, j = x + dx, y + dy
-            if 0 <= i < self.height and 0 <= j < self.width:
-                yield i, j
-
-    
 def dijkstra(grid: Grid) -> int:
-    inf = grid.height * grid.width * 10
-    dist = [[inf] * grid.width for _ in range(grid.height)]
+    risks = grid.cells.tolist()
+    inf = grid.n * grid.m * 10
+    dist = [[inf] * grid.m for _ in range(grid.n)]
     dist[0][0] = 0
     heap = [(dist[0][0], 0, 0)]
 
@@ -52,19 +35,19 @@ def dijkstra(grid: Grid) -> int:
             continue
 
         for i, j in grid.neighbours(x, y):
-            if dist[i][j] > d + grid.get(i, j):
-                dist[i][j] = d + grid.get(i, j)
+            if dist[i][j] > d + risks[i][j]:
+                dist[i][j] = d + risks[i][j]
                 heapq.heappush(heap, (dist[i][j], i, j))
 
-    return dist[grid.height - 1][grid.width - 1]
+    return dist[grid.n - 1][grid.m - 1]
 
 
-def task1(grid: List[List[int]]) -> int:
-    return dijkstra(Grid(grid, repeats=1))
+def task1(grid: Grid) -> int:
+    return dijkstra(tile(grid, repeats=1))
 
 
-def task2(grid: List[List[int]]) -> int:
-    return dijkstra(Grid(grid, repeats=5))
+def task2(grid: Grid) -> int:
+    return dijkstra(tile(grid, repeats=5))
 
 
 if __name__ == '__main__':
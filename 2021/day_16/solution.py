@@ -23,8 +23,8 @@ HEXADECIMAL_TO_BINARY = {
 }
 
 
-def read_input() -> str:
-    with open('input.txt', 'r') as reader:
+def read_input(path: str = 'input.txt') -> str:
+    with open(path, 'r') as reader:
         hexadecimal_transmission = reader.read().strip()
         return ''.join(map(HEXADECIMAL_TO_BINARY.get, hexadecimal_transmission))
 
@@ -6,8 +6,8 @@ from typing import Iterator, Tuple
 INPUT_RE = re.compile(r'^target area: x=(-?\d+)\.\.(-?\d+), y=(-?\d+)\.\.(-?\d+)\n$')
 
 
-def read_input():
-    with open('input.txt', 'r') as reader:
+def read_input(path: str = 'input.txt'):
+    with open(path, 'r') as reader:
         line = reader.readline()
         x1, x2, y1, y2 = INPUT_RE.fullmatch(line).groups()
         return int(x1), int(x2), int(y1), int(y2)
@@ -115,7 +115,7 @@ def task2(range_x: Range, range_y: Range) -> int:
 
     for x_velocity in range(min_x_velocity, max_x_velocity + 1):
         trajectory = TrajectoryWithDrag(0, x_velocity)
-        if trajectory.passes_through_range(x_range):
+        if trajectory.passes_through_range(range_x):
             x_trajectories.add(trajectory)
 
     min_y_velocity = range_y.min
@@ -124,7 +124,7 @@ def task2(range_x: Range, range_y: Range) -> int:
 
     for y_velocity in range(min_y_velocity, max_y_velocity + 1):
         trajectory = TrajectoryWithAcceleration(0, y_velocity, -1)
-        if trajectory.passes_through_range(y_range):
+        if trajectory.passes_through_range(range_y):
             y_trajectories.add(trajectory)
 
     valid_probe_trajectories = 0
@@ -132,7 +132,7 @@ def task2(range_x: Range, range_y: Range) -> int:
     for x_trajectory in x_trajectories:
         for y_trajectory in y_trajectories:
             probe_trajectory = ProbeTrajectory(x_trajectory, y_trajectory)
-            if probe_trajectory.passes_through_area(x_range, y_range):
+            if probe_trajectory.passes_through_area(range_x, range_y):
                 valid_probe_trajectories += 1
 
     return valid_probe_trajectories
@@ -1,8 +1,14 @@
 import copy
 import functools
 import operator
+import sys
+from pathlib import Path
 from typing import Optional, List, Iterator, Tuple
 
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from common import inputs  # noqa: E402
+
 
 class Node:
     parent: Optional['Node']
@@ -166,9 +172,8 @@ def parse_node(s: str, parent: Optional[Node] = None) -> Node:
         return Node.pair_node(parse_node(s[1:i]), parse_node(s[i + 1:-1]), parent)
 
 
-def read_input() -> List[Node]:
-    with open('input.txt', 'r') as reader:
-        return [parse_node(line.strip()) for line in reader.readlines()]
+def read_input(path: str = 'input.txt') -> List[Node]:
+    return [parse_node(line.strip()) for line in inputs.text_lines(path) if line]
 
 
 def task1(nodes: List[Node]) -> int:
@@ -1,92 +1,60 @@
+import sys
+from pathlib import Path
 from typing import List, Tuple
 
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from common.grid import SQUARE, Grid  # noqa: E402
+
 
 class Matrix:
-    DELTAS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 0), (0, 1), (1, -1), (1, 0), (1, 1)]
+    # the 3x3 square around a pixel, read in reading order, is a 9-bit binary index into the algorithm
+    POWERS = [1 << power for power in reversed(range(len(SQUARE)))]
 
     filler: int
-    grid: List[List[int]]
-    length: int
-    width: int
-    algorithm: List[int]
+    grid: Grid
+    algorithm: np.ndarray
 
-    def __init__(self, algorithm: List[int], grid: List[List[int]]):
+    def __init__(self, algorithm: List[int], grid: Grid):
         self.filler = 0
         self.grid = grid
-        self.length = len(grid)
-        self.width = len(grid[0])
-        self.algorithm = algorithm
-        self.normalise()
-
-    def is_filled(self, layer: int) -> bool:
-        for i in range(self.length):
-            if self.grid[i][layer] != self.filler or self.grid[i][self.width - 1 - layer] != self.filler:
-                return False
-
-        for j in range(self.width):
-            if self.grid[layer][j] != self.filler or self.grid[self.length - 1 - layer][j] != self.filler:
-                return False
-
-        return True
-
-    def outer_layer_thickness(self) -> int:
-        max_thickness = min((self.length + 1) // 2, (self.width + 1) // 2)
-        for layer in range(max_thickness):
-            if not self.is_filled(layer):
-                return layer
-        return max_thickness
-
-    def remove_boundary(self, thickness: int):
-        self.grid = [row[thickness: -thickness] for row in self.grid[thickness: -thickness]]
-        self.length = len(self.grid)
-        self.width = len(self.grid[0])
-
-    def add_boundary(self):
-        empty_cell = lambda: [self.filler]
-        empty_row = lambda: [empty_cell() * (self.width + 2)]
-        extended_row = lambda row: empty_cell() + row + empty_cell()
-        self.grid = empty_row() + [extended_row(row) for row in self.grid] + empty_row()
-        self.length = len(self.grid)
-        self.width = len(self.grid[0])
-
-    def normalise(self):
-        thickness = self.outer_layer_thickness()
-        if thickness > 1:
-            self.remove_boundary(thickness - 1)
-        if thickness == 0:
-            self.add_boundary()
-
-    def apply_algorithm(self, x: int, y: int) -> int:
-        value = 0
-        powers = reversed(range(len(self.DELTAS)))
-
-        for power, (dx, dy) in zip(powers, self.DELTAS):
-            i, j = x + dx, y + dy
-            if 0 <= i < self.length and 0 <= j < self.width:
-                value ^= self.grid[i][j] << power
-            else:
-                value ^= self.filler << power
-
-        return self.algorithm[value]
+        self.algorithm = np.array(algorithm, dtype=np.uint8)
+
+    @property
+    def length(self) -> int:
+        return self.grid.n
+
+    @property
+    def width(self) -> int:
+        return self.grid.m
 
     def next_step(self):
-        self.grid = [[self.apply_algorithm(i, j) for j in range(self.width)] for i in range(self.length)]
-        self.filler = self.apply_algorithm(-1, -1)
-        self.normalise()
+        # every pixel within one step of the image can change, all the others are the filler
+        extended = Grid(self.grid.padded(1, self.filler))
+        neighbours = extended.neighbour_views(SQUARE, self.filler)
+
+        index = np.zeros(extended.cells.shape, dtype=np.uint16)
+        for power, neighbour in zip(self.POWERS, neighbours):
+            index += neighbour * np.uint16(power)
+
+        self.grid = Grid(self.algorithm[index])
+        self.filler = int(self.algorithm[0 if self.filler == 0 else len(self.algorithm) - 1])
 
     def lit_pixel_count(self) -> int:
-        return sum(map(sum, self.grid))
+        return int(self.grid.cells.sum())
 
 
-def read_input() -> Tuple[List[int], List[List[int]]]:
-    with open('input.txt', 'r') as reader:
+def read_input(path: str = 'input.txt') -> Tuple[List[int], Grid]:
+    with open(path, 'r') as reader:
         algorithm, grid = reader.read().split('\n\n')
         algorithm = [(1 if c == '#' else 0) for c in algorithm.strip()]
-        grid = [[(1 if c == '#' else 0) for c in row.strip()] for row in grid.split()]
+        grid = Grid.from_rows([(1 if c == '#' else 0) for c in row.strip()] for row in grid.split())
         return algorithm, grid
 
 
-def task(algorithm: List[int], grid: List[List[int]], steps: int) -> int:
+def task(algorithm: List[int], grid: Grid, steps: int) -> int:
     matrix = Matrix(algorithm, grid)
     for _ in range(steps):
         matrix.next_step()
@@ -71,8 +71,8 @@ def parse_block(block: str) -> Block:
     return Block(tuple(parse_instruction(instruction.strip()) for instruction in block.splitlines()))
 
 
-def read_input() -> List[Block]:
-    with open('input.txt', 'r') as reader:
+def read_input(path: str = 'input.txt') -> List[Block]:
+    with open(path, 'r') as reader:
         return [parse_block(block) for block in reader.read().split('inp w\n') if block]
 
 